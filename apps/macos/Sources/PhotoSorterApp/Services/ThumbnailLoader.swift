@@ -38,13 +38,17 @@ actor ThumbnailLoader {
 
     // MARK: - Configuration
 
-    private static let maxGridMemoryCacheEntries: Int = 180
+    /// Budget for decoded grid thumbnails held in memory. Charged by pixel
+    /// bytes rather than entry count, since a 1024 px thumbnail is ~3 MB.
+    private static let maxGridMemoryCacheBytes: Int = 256 * 1024 * 1024
 
     // MARK: - Grid memory cache
 
     private var cache: [String: NSImage] = [:]
     private var inFlight: [String: Task<NSImage?, Never>] = [:]
     private var insertionOrder: [String] = []
+    private var cacheCost: [String: Int] = [:]
+    private var totalCacheCost: Int = 0
 
     // MARK: - Detail proxy generation
 
@@ -151,6 +155,7 @@ actor ThumbnailLoader {
     /// Invalidate the in-memory grid cache entry by path.
     func invalidate(path: String) {
         cache.removeValue(forKey: path)
+        totalCacheCost -= cacheCost.removeValue(forKey: path) ?? 0
         insertionOrder.removeAll { $0 == path }
         inFlight[path]?.cancel()
         inFlight.removeValue(forKey: path)
@@ -166,10 +171,19 @@ actor ThumbnailLoader {
         guard oldPath != newPath else { return }
 
         if let image = cache.removeValue(forKey: oldPath) {
+            // Drop whatever was cached under the new path so its cost is not
+            // counted twice once the old entry takes its place.
+            if cache.removeValue(forKey: newPath) != nil {
+                insertionOrder.removeAll { $0 == newPath }
+            }
+            totalCacheCost -= cacheCost.removeValue(forKey: newPath) ?? 0
             if let idx = insertionOrder.firstIndex(of: oldPath) {
                 insertionOrder[idx] = newPath
             }
             cache[newPath] = image
+            if let cost = cacheCost.removeValue(forKey: oldPath) {
+                cacheCost[newPath] = cost
+            }
         }
 
         if let task = inFlight.removeValue(forKey: oldPath) {
@@ -204,13 +218,26 @@ actor ThumbnailLoader {
     // MARK: - Private helpers
 
     private func cacheGridImage(_ image: NSImage, for path: String) {
-        if cache.count >= Self.maxGridMemoryCacheEntries, cache[path] == nil {
-            evictOldest()
-        }
-
+        let cost = Self.decodedByteCost(of: image)
+        totalCacheCost += cost - (cacheCost[path] ?? 0)
         cache[path] = image
+        cacheCost[path] = cost
         insertionOrder.removeAll { $0 == path }
         insertionOrder.append(path)
+
+        // Always keep the newest entry, even if it alone exceeds the budget.
+        while totalCacheCost > Self.maxGridMemoryCacheBytes, insertionOrder.count > 1 {
+            evictOldest()
+        }
+    }
+
+    /// Approximate decoded size of `image` (RGBA, 4 bytes per pixel).
+    private static func decodedByteCost(of image: NSImage) -> Int {
+        let pixels = image.representations.map { $0.pixelsWide * $0.pixelsHigh }.max() ?? 0
+        if pixels > 0 {
+            return pixels * 4
+        }
+        return Int(image.size.width * image.size.height) * 4
     }
 
     /// Generate a proportional thumbnail using ImageIO and apply EXIF orientation.
@@ -335,5 +362,6 @@ actor ThumbnailLoader {
         guard !insertionOrder.isEmpty else { return }
         let oldest = insertionOrder.removeFirst()
         cache.removeValue(forKey: oldest)
+        totalCacheCost -= cacheCost.removeValue(forKey: oldest) ?? 0
     }
 }
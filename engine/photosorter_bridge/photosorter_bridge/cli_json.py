@@ -10,7 +10,6 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
 import logging
 import sys
 from pathlib import Path
@@ -20,6 +19,7 @@ from photosorter_bridge.pipeline_runner import (
     build_pipeline_params,
     run_pipeline_with_progress,
 )
+from photosorter import _json
 from photosorter.config import DEFAULTS
 from photosorter.pipeline import PipelineParams
 
@@ -37,9 +37,19 @@ def _setup_stderr_logging() -> None:
 
 
 def _emit(obj: dict) -> None:
-    """Write a single JSON object as one line to stdout and flush."""
-    sys.stdout.write(json.dumps(obj, default=str) + "\n")
-    sys.stdout.flush()
+    """Write a single JSON object as one line to stdout and flush.
+
+    Bytes go straight to the binary buffer when stdout has one, skipping
+    the text layer's encode step.
+    """
+    line = _json.dumps(obj, newline=True, default=str)
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        sys.stdout.write(line.decode("utf-8"))
+        sys.stdout.flush()
+        return
+    out.write(line)
+    out.flush()
 
 
 def _on_progress(info: StepInfo) -> None:
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
@@ -14,7 +15,7 @@ from photosorter.embeddings import detect_device, extract_embeddings, load_model
 from photosorter.ordering import build_ordered_sequence
 from photosorter.output import output_manifest
 from photosorter.pipeline import PipelineOutcome, PipelineParams, run_pipeline_shared
-from photosorter.similarity import compute_distance_matrix, compute_similarity_matrix
+from photosorter.similarity import compute_condensed_distance
 from photosorter.utils import discover_images
 
 logger = logging.getLogger("photosorter")
@@ -84,12 +85,55 @@ def build_pipeline_params(
 build_args_namespace = build_pipeline_params
 
 
+# Counted progress (e.g. per embedding batch) is coalesced to at most
+# ~30 updates/s unless it advanced by at least 1% of the total.
+_PROGRESS_MIN_INTERVAL_S = 1.0 / 30.0
+_PROGRESS_MIN_FRACTION = 0.01
+
+
+class _ProgressThrottle:
+    """Forward progress events at a bounded rate.
+
+    Step changes and step completion (``processed == total``) always go
+    through; intermediate counted updates are dropped when they arrive
+    too soon after the last forwarded one and moved less than 1%.
+    """
+
+    def __init__(
+        self,
+        on_progress: Callable[[StepInfo], None],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._on_progress = on_progress
+        self._clock = clock
+        self._last_step: str | None = None
+        self._last_processed = 0
+        self._last_time = 0.0
+
+    def __call__(self, step: str, detail: str, processed: int, total: int) -> None:
+        now = self._clock()
+        if (
+            step == self._last_step
+            and 0 < processed < total
+            and now - self._last_time < _PROGRESS_MIN_INTERVAL_S
+            and processed - self._last_processed < total * _PROGRESS_MIN_FRACTION
+        ):
+            return
+        self._last_step = step
+        self._last_processed = processed
+        self._last_time = now
+        self._on_progress(StepInfo(step, detail, processed, total))
+
+
 def run_pipeline_with_progress(
     params: PipelineParams,
     on_progress: Callable[[StepInfo], None],
 ) -> PipelineOutcome:
     """Run the full pipeline, calling *on_progress* at each step.
 
+    Per-batch progress is rate-limited (see ``_ProgressThrottle``); every
+    step's first and final update is always delivered.
+
     Returns the PipelineOutcome on success (contains manifest_path).
     Raises on failure (the caller is responsible for catching exceptions).
     """
@@ -99,13 +143,10 @@ def run_pipeline_with_progress(
         detect_device_fn=detect_device,
         load_model_fn=load_model,
         extract_embeddings_fn=extract_embeddings,
-        compute_similarity_matrix_fn=compute_similarity_matrix,
-        compute_distance_matrix_fn=compute_distance_matrix,
+        compute_condensed_distance_fn=compute_condensed_distance,
         cluster_fn=cluster,
         build_ordered_sequence_fn=build_ordered_sequence,
         output_manifest_fn=output_manifest,
-        on_progress=lambda step, detail, processed, total: on_progress(
-            StepInfo(step, detail, processed, total),
-        ),
+        on_progress=_ProgressThrottle(on_progress),
         log=logger,
     )
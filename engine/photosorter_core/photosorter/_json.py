@@ -0,0 +1,51 @@
+"""JSON encode/decode to bytes, via orjson when the ``fast`` extra is installed.
+
+Both backends produce the same bytes: compact separators (or 2-space
+indentation) and non-ASCII characters left as UTF-8.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def loads(data: bytes) -> Any:
+    """Parse UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(
+    obj: Any,
+    *,
+    indent: bool = False,
+    newline: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> bytes:
+    """Serialize *obj* to UTF-8 bytes.
+
+    *indent* uses 2-space indentation, *newline* appends ``"\\n"`` and
+    *default* converts objects JSON cannot represent natively.
+    """
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, default=default, option=option or None)
+    if indent:
+        text = json.dumps(obj, indent=2, default=default, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, separators=(",", ":"), default=default, ensure_ascii=False)
+    if newline:
+        text += "\n"
+    return text.encode("utf-8")
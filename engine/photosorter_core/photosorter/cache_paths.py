@@ -15,3 +15,8 @@ def cache_dir_for_input(input_dir: Path) -> Path:
 def manifest_path_for_input(input_dir: Path) -> Path:
     """Return the manifest path under the cache root."""
     return cache_dir_for_input(input_dir) / DEFAULTS.manifest_filename
+
+
+def embedding_cache_dir_for_input(input_dir: Path) -> Path:
+    """Return the on-disk embedding cache directory under the cache root."""
+    return cache_dir_for_input(input_dir) / DEFAULTS.embedding_cache_dirname
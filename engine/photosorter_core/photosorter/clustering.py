@@ -4,10 +4,19 @@ import logging
 from dataclasses import dataclass
 
 import numpy as np
-from sklearn.cluster import AgglomerativeClustering
+from scipy.cluster.hierarchy import fcluster
+from scipy.cluster.hierarchy import linkage as hierarchy_linkage
+from scipy.spatial.distance import num_obs_y, squareform
 
 from photosorter.config import DEFAULTS
 
+try:
+    # Optional: NN-chain linkage in O(n^2 log n), same method names and
+    # output format as SciPy.
+    from fastcluster import linkage as hierarchy_linkage
+except ImportError:  # pragma: no cover - depends on the environment
+    pass
+
 logger = logging.getLogger("photosorter")
 
 
@@ -22,7 +31,17 @@ def cluster(
     distance_threshold: float = DEFAULTS.distance_threshold,
     linkage: str = DEFAULTS.linkage,
 ) -> ClusterResult:
-    n = dist.shape[0]
+    """Cut an agglomerative tree over *dist* at *distance_threshold*.
+
+    *dist* is either the square N x N distance matrix or its condensed
+    upper triangle (length N*(N-1)/2, as ``squareform`` produces).
+    """
+    condensed_input = dist.ndim == 1
+    if condensed_input:
+        # An empty condensed vector describes a single photo.
+        n = num_obs_y(dist) if dist.size else 1
+    else:
+        n = dist.shape[0]
     if n == 0:
         labels = np.zeros(0, dtype=int)
         logger.info("No photos to cluster")
@@ -32,14 +51,15 @@ def cluster(
         logger.info("Single photo — assigned to cluster 0")
         return ClusterResult(labels=labels, n_clusters=1)
 
-    clusterer = AgglomerativeClustering(
-        n_clusters=None,
-        distance_threshold=distance_threshold,
-        metric="precomputed",
-        linkage=linkage,
+    # Linkage works on the condensed upper triangle: half the memory of
+    # the square matrix, and no float64 copy of the full N x N array.
+    condensed = (
+        dist if condensed_input
+        else squareform(dist, force="tovector", checks=False)
     )
-    labels = clusterer.fit_predict(dist)
-    n_clusters = len(set(labels))
+    tree = hierarchy_linkage(condensed, method=linkage)
+    labels = fcluster(tree, t=distance_threshold, criterion="distance") - 1
+    n_clusters = int(labels.max()) + 1
     logger.info(
         "Agglomerative found %d clusters (threshold=%.3f, linkage=%s)",
         n_clusters,
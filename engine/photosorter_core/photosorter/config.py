@@ -25,6 +25,12 @@ class Defaults:
     # Device
     device: str = "auto"
 
+    # Data loading: DataLoader decode worker processes. Each worker is a
+    # spawned process on macOS that re-imports torch, so small jobs decode
+    # in-process and larger ones use only a few workers.
+    max_loader_workers: int = 4
+    min_images_for_loader_workers: int = 256
+
     # Image preprocessing
     resize_size: int = 256
     crop_size: int = 256
@@ -43,6 +49,7 @@ class Defaults:
     cache_dirname: str = "PhotoSorter_Cache"
     grid_thumb_dirname: str = "GridThumb"
     detail_proxy_dirname: str = "DetailProxy"
+    embedding_cache_dirname: str = "Embeddings"
 
     # Supported image extensions
     image_extensions: tuple[str, ...] = (
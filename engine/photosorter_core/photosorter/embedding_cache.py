@@ -0,0 +1,204 @@
+"""On-disk embedding cache so unchanged photos skip the model forward.
+
+Rows live in a flat float32 file read back through ``np.memmap``; a JSON
+index maps each image key (path, mtime, size) to its row.  The index
+header records the model, embedding settings, device and compute
+precision, and any mismatch discards the whole cache.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+from photosorter import _json
+from photosorter.utils import resolve_paths
+
+logger = logging.getLogger("photosorter")
+
+DATA_FILENAME = "embeddings.f32"
+INDEX_FILENAME = "index.json"
+_INDEX_VERSION = 1
+
+
+def cache_key(path: Path) -> str | None:
+    """Key an image by resolved path, mtime and size; ``None`` if unstattable."""
+    return cache_keys([path])[0]
+
+
+def cache_keys(paths: list[Path]) -> list[str | None]:
+    """:func:`cache_key` for many paths, resolving each parent folder once."""
+    stats: list[os.stat_result | None] = []
+    for path in paths:
+        try:
+            stats.append(path.stat())
+        except OSError:
+            stats.append(None)
+    resolved = iter(resolve_paths(p for p, st in zip(paths, stats) if st is not None))
+    return [
+        None if st is None else f"{next(resolved)}|{st.st_mtime_ns}|{st.st_size}"
+        for st in stats
+    ]
+
+
+class EmbeddingCache:
+    """Append-only embedding store for one input folder.
+
+    Lookups read rows from the existing data file; new rows are buffered
+    by :meth:`put_many` and written by :meth:`flush`.  Entries that were
+    neither read nor written during this run are dropped on flush, and
+    the data file is compacted once most of its rows are dead.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        *,
+        model_id: str,
+        preprocess: str,
+        pooling: str,
+        device: str,
+        precision: str,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self._data_path = cache_dir / DATA_FILENAME
+        self._index_path = cache_dir / INDEX_FILENAME
+        self._header = {
+            "version": _INDEX_VERSION,
+            "model_id": model_id,
+            "preprocess": preprocess,
+            "pooling": pooling,
+            # FP16 autocast and FP32 embeddings differ slightly; never mix.
+            "device": device,
+            "precision": precision,
+        }
+        self._dim: int | None = None
+        self._n_rows = 0
+        self._rows: dict[str, int] = {}
+        self._live: dict[str, int] = {}
+        self._pending_keys: list[str] = []
+        self._pending: list[np.ndarray] = []
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            index = _json.loads(self._index_path.read_bytes())
+            data_size = self._data_path.stat().st_size
+        except (OSError, ValueError):
+            return
+        if not isinstance(index, dict) or index.get("header") != self._header:
+            logger.info("Embedding cache settings changed; recomputing embeddings")
+            return
+        dim = index.get("dim")
+        rows = index.get("rows")
+        if not isinstance(dim, int) or dim < 1 or not isinstance(rows, dict):
+            return
+        n_rows = data_size // (dim * 4)
+        self._dim = dim
+        self._n_rows = n_rows
+        # Rows past the end of the data file come from an interrupted
+        # write; treat them as misses.
+        self._rows = {
+            key: row for key, row in rows.items()
+            if isinstance(row, int) and 0 <= row < n_rows
+        }
+
+    def get_many(self, keys: list[str | None]) -> tuple[list[int], np.ndarray | None]:
+        """Return (positions, embeddings) for the keys present in the cache."""
+        positions = [i for i, key in enumerate(keys) if key in self._rows]
+        if not positions:
+            return [], None
+        data = np.memmap(
+            self._data_path,
+            dtype=np.float32,
+            mode="r",
+            shape=(self._n_rows, self._dim),
+        )
+        rows = [self._rows[keys[i]] for i in positions]
+        embeddings = np.array(data[rows], dtype=np.float32)
+        del data
+        for i, row in zip(positions, rows):
+            self._live[keys[i]] = row
+        return positions, embeddings
+
+    def put_many(self, keys: list[str | None], embeddings: np.ndarray) -> None:
+        """Buffer new rows; keys that are ``None`` are skipped."""
+        if embeddings.ndim != 2 or not len(embeddings):
+            return
+        dim = int(embeddings.shape[1])
+        if self._dim is not None and dim != self._dim:
+            # Embedding width changed under the same header; start over.
+            self._rows.clear()
+            self._live.clear()
+            self._n_rows = 0
+        self._dim = dim
+        for key, emb in zip(keys, embeddings):
+            if key is not None:
+                self._pending_keys.append(key)
+                self._pending.append(emb)
+
+    def flush(self) -> None:
+        """Persist buffered rows and the index; failures only log a warning."""
+        if not self._pending and self._live.keys() == self._rows.keys():
+            return
+        try:
+            self._write()
+        except OSError as exc:
+            logger.warning("Could not write embedding cache: %s", exc)
+        self._pending_keys.clear()
+        self._pending.clear()
+
+    def _write(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        new_rows = (
+            np.asarray(np.stack(self._pending), dtype=np.float32)
+            if self._pending
+            else np.empty((0, self._dim or 0), dtype=np.float32)
+        )
+        total_live = len(self._live) + len(new_rows)
+
+        if self._n_rows and self._n_rows <= 2 * total_live:
+            # Append in place; index rows for existing entries are unchanged.
+            # Truncate first so a torn tail from an interrupted write cannot
+            # misalign the new rows.
+            with open(self._data_path, "r+b") as fh:
+                fh.seek(self._n_rows * self._dim * 4)
+                fh.truncate()
+                fh.write(new_rows.tobytes())
+            start = self._n_rows
+            rows = dict(self._live)
+        else:
+            # Empty, invalidated or mostly dead: rewrite only the live rows.
+            kept_keys = list(self._live)
+            if kept_keys:
+                old = np.memmap(
+                    self._data_path,
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(self._n_rows, self._dim),
+                )
+                kept = np.array(old[[self._live[k] for k in kept_keys]])
+                del old
+            else:
+                kept = np.empty((0, new_rows.shape[1]), dtype=np.float32)
+            tmp = self._data_path.with_suffix(".tmp")
+            with open(tmp, "wb") as fh:
+                fh.write(kept.tobytes())
+                fh.write(new_rows.tobytes())
+            os.replace(tmp, self._data_path)
+            start = len(kept_keys)
+            rows = {key: i for i, key in enumerate(kept_keys)}
+
+        for offset, key in enumerate(self._pending_keys):
+            rows[key] = start + offset
+        self._n_rows = start + len(new_rows)
+        self._rows = rows
+        self._live = dict(rows)
+
+        index = {"header": self._header, "dim": self._dim, "rows": rows}
+        tmp = self._index_path.with_suffix(".tmp")
+        tmp.write_bytes(_json.dumps(index))
+        os.replace(tmp, self._index_path)
@@ -20,7 +20,7 @@ from photosorter.pipeline import (
     PipelineParams,
     run_pipeline_shared,
 )
-from photosorter.similarity import compute_distance_matrix, compute_similarity_matrix
+from photosorter.similarity import compute_condensed_distance
 from photosorter.utils import discover_images, setup_logging
 
 
@@ -86,8 +86,7 @@ def run_pipeline(args: argparse.Namespace) -> None:
             detect_device_fn=detect_device,
             load_model_fn=load_model,
             extract_embeddings_fn=extract_embeddings,
-            compute_similarity_matrix_fn=compute_similarity_matrix,
-            compute_distance_matrix_fn=compute_distance_matrix,
+            compute_condensed_distance_fn=compute_condensed_distance,
             cluster_fn=cluster,
             build_ordered_sequence_fn=build_ordered_sequence,
             output_manifest_fn=output_manifest,
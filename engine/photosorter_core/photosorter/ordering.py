@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -17,35 +17,98 @@ class OrderedPhoto:
     cluster_id: int
 
 
+@dataclass(frozen=True, eq=False)
+class OrderedPhotos(Sequence[OrderedPhoto]):
+    """Ordered sequence stored as parallel arrays (structure of arrays).
+
+    Indexing and iteration yield :class:`OrderedPhoto` views so callers
+    that treat the result as a list keep working; bulk consumers such as
+    the manifest writer use the arrays directly.
+    """
+
+    positions: np.ndarray
+    original_indices: np.ndarray
+    cluster_ids: np.ndarray
+    paths: list[Path]
+
+    @classmethod
+    def from_records(cls, photos: Iterable[OrderedPhoto]) -> OrderedPhotos:
+        photos = list(photos)
+        return cls(
+            positions=np.array([p.position for p in photos], dtype=np.int32),
+            original_indices=np.array([p.original_index for p in photos], dtype=np.int32),
+            cluster_ids=np.array([p.cluster_id for p in photos], dtype=np.int32),
+            paths=[p.path for p in photos],
+        )
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __getitem__(self, index: int) -> OrderedPhoto:
+        if isinstance(index, slice):
+            raise TypeError("OrderedPhotos does not support slicing")
+        return OrderedPhoto(
+            position=int(self.positions[index]),
+            original_index=int(self.original_indices[index]),
+            path=self.paths[index],
+            cluster_id=int(self.cluster_ids[index]),
+        )
+
+    def __iter__(self) -> Iterator[OrderedPhoto]:
+        for position, original_index, path, cluster_id in zip(
+            self.positions.tolist(),
+            self.original_indices.tolist(),
+            self.paths,
+            self.cluster_ids.tolist(),
+        ):
+            yield OrderedPhoto(position, original_index, path, cluster_id)
+
+
+def _first_occurrence(labels: np.ndarray) -> np.ndarray:
+    """Index of the first photo carrying each photo's label.
+
+    Cluster ids from ``cluster()`` are dense ``0..k-1``, so a group-min
+    over a ``k``-sized table is linear; other labels go through
+    ``np.unique``.
+    """
+    n = len(labels)
+    if labels.dtype.kind in "iu" and labels.min() >= 0 and labels.max() < n:
+        first = np.full(int(labels.max()) + 1, n, dtype=np.intp)
+        np.minimum.at(first, labels, np.arange(n, dtype=np.intp))
+        return first[labels]
+    _, first_index, inverse = np.unique(
+        labels, return_index=True, return_inverse=True,
+    )
+    return first_index[inverse.ravel()]
+
+
 def build_ordered_sequence(
     paths: list[Path],
     labels: np.ndarray,
     *,
     original_indices: list[int] | None = None,
-) -> list[OrderedPhoto]:
+) -> OrderedPhotos:
     """Group by cluster, sort clusters by earliest member, keep original order within."""
+    n = len(paths)
+    labels = np.asarray(labels)
     if original_indices is None:
-        original_indices = list(range(len(paths)))
-    if len(original_indices) != len(paths):
+        original_indices = list(range(n))
+    if len(original_indices) != n:
         raise ValueError("original_indices length must match paths length")
+    if len(labels) != n:
+        raise ValueError("labels length must match paths length")
+
+    if labels.size == 0:
+        return OrderedPhotos.from_records([])
+
+    # Giving every photo its cluster's first index and stable-sorting on
+    # it groups clusters by earliest member while keeping original order
+    # within each one.
+    sequence = np.argsort(_first_occurrence(labels), kind="stable")
 
-    clusters: dict[int, list[int]] = defaultdict(list)
-    for idx, label in enumerate(labels):
-        clusters[int(label)].append(idx)
-
-    # Sort clusters by the earliest original index in each cluster
-    sorted_cluster_ids = sorted(clusters.keys(), key=lambda cid: clusters[cid][0])
-
-    ordered: list[OrderedPhoto] = []
-    position = 0
-    for cid in sorted_cluster_ids:
-        for idx in clusters[cid]:
-            ordered.append(OrderedPhoto(
-                position=position,
-                original_index=original_indices[idx],
-                path=paths[idx],
-                cluster_id=cid,
-            ))
-            position += 1
-
-    return ordered
+    return OrderedPhotos(
+        positions=np.arange(len(sequence), dtype=np.int32),
+        original_indices=np.asarray(original_indices, dtype=np.int32)[sequence],
+        cluster_ids=labels[sequence].astype(np.int32, copy=False),
+        paths=[paths[i] for i in sequence.tolist()],
+    )
@@ -2,17 +2,56 @@
 
 from __future__ import annotations
 
-import json
 import logging
+import os
+from collections.abc import Iterable, Iterator, Sequence
 from pathlib import Path
+from typing import BinaryIO
 
-from photosorter.ordering import OrderedPhoto
+import numpy as np
+
+from photosorter import _json
+from photosorter.ordering import OrderedPhoto, OrderedPhotos
+from photosorter.utils import resolve_paths
 
 logger = logging.getLogger("photosorter")
 
 
+def _cluster_runs(cluster_ids: np.ndarray) -> tuple[np.ndarray, Iterator[tuple[int, int, int]]]:
+    """Group photos by cluster in order of first appearance.
+
+    Returns (order, runs): *order* permutes the photos so each cluster is
+    contiguous (original order kept within a cluster) and *runs* yields
+    (cluster_id, start, stop) slices into that permutation.
+    """
+    if cluster_ids.size == 0:
+        return np.zeros(0, dtype=np.intp), iter(())
+
+    # build_ordered_sequence already emits each cluster as one contiguous
+    # run; detect that in a linear pass and skip the sort entirely.
+    n = len(cluster_ids)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(cluster_ids)) + 1))
+    run_ids = cluster_ids[starts]
+    if len(np.unique(run_ids)) == len(run_ids):
+        stops = np.append(starts[1:], n)
+        runs = zip(run_ids.tolist(), starts.tolist(), stops.tolist())
+        return np.arange(n, dtype=np.intp), runs
+
+    unique_ids, first_index, inverse, counts = np.unique(
+        cluster_ids, return_index=True, return_inverse=True, return_counts=True,
+    )
+    order = np.argsort(first_index[inverse.ravel()], kind="stable")
+    group_order = np.argsort(first_index)
+    stops = np.cumsum(counts[group_order])
+    starts = stops - counts[group_order]
+    runs = zip(
+        unique_ids[group_order].tolist(), starts.tolist(), stops.tolist(),
+    )
+    return order, runs
+
+
 def output_manifest(
-    ordered: list[OrderedPhoto],
+    ordered: Sequence[OrderedPhoto],
     output_path: Path,
     *,
     input_dir: Path,
@@ -24,15 +63,20 @@ def output_manifest(
     batch_size: int | None = None,
     device: str | None = None,
 ) -> None:
-    # Group photos by cluster
-    grouped: dict[int, list[OrderedPhoto]] = {}
-    for photo in ordered:
-        grouped.setdefault(photo.cluster_id, []).append(photo)
+    photos = (
+        ordered if isinstance(ordered, OrderedPhotos)
+        else OrderedPhotos.from_records(ordered)
+    )
+    order, runs = _cluster_runs(photos.cluster_ids)
+    positions = photos.positions[order].tolist()
+    original_indices = photos.original_indices[order].tolist()
+    paths = [photos.paths[i] for i in order.tolist()]
+    original_paths = resolve_paths(paths)
 
-    manifest = {
+    header = {
         "version": 1,
         "input_dir": str(input_dir),
-        "total": len(ordered),
+        "total": len(photos),
         "parameters": {
             k: v
             for k, v in {
@@ -46,23 +90,47 @@ def output_manifest(
             }.items()
             if v is not None
         },
-        "clusters": [
-            {
-                "cluster_id": cid,
-                "count": len(photos),
-                "photos": [
-                    {
-                        "position": photo.position,
-                        "original_index": photo.original_index,
-                        "filename": photo.path.name,
-                        "original_path": str(photo.path.resolve()),
-                    }
-                    for photo in photos
-                ],
-            }
-            for cid, photos in grouped.items()
-        ],
     }
+    clusters = (
+        {
+            "cluster_id": cid,
+            "count": stop - start,
+            "photos": [
+                {
+                    "position": positions[i],
+                    "original_index": original_indices[i],
+                    "filename": paths[i].name,
+                    "original_path": original_paths[i],
+                }
+                for i in range(start, stop)
+            ],
+        }
+        for cid, start, stop in runs
+    )
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(manifest, indent=2) + "\n")
+    # Write to a sibling temp file and rename, so readers never see a
+    # half-written manifest while clusters are being streamed out.
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    with open(tmp_path, "wb", buffering=1 << 20) as fh:
+        _write_manifest(fh, header, clusters)
+    os.replace(tmp_path, output_path)
     logger.info("Manifest written → %s", output_path)
+
+
+def _write_manifest(fh: BinaryIO, header: dict, clusters: Iterable[dict]) -> None:
+    """Stream ``header`` plus a ``clusters`` list as indented JSON.
+
+    Clusters are serialized one at a time, so the full manifest never
+    exists as a single dict or string; the layout matches
+    ``json.dumps({**header, "clusters": [...]}, indent=2,
+    ensure_ascii=False) + "\n"``.
+    """
+    head = _json.dumps(header, indent=True)
+    fh.write(head[: -len(b"\n}")])
+    fh.write(b',\n  "clusters": [')
+    wrote_any = False
+    for cluster in clusters:
+        fh.write(b",\n    " if wrote_any else b"\n    ")
+        fh.write(_json.dumps(cluster, indent=True).replace(b"\n", b"\n    "))
+        wrote_any = True
+    fh.write(b"\n  ]\n}\n" if wrote_any else b"]\n}\n")
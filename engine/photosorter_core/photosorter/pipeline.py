@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import functools
 import inspect
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -12,7 +13,10 @@ from typing import Any
 import numpy as np
 
 from photosorter.config import DEFAULTS
-from photosorter.cache_paths import manifest_path_for_input
+from photosorter.cache_paths import (
+    embedding_cache_dir_for_input,
+    manifest_path_for_input,
+)
 from photosorter.ordering import OrderedPhoto
 
 ProgressCallback = Callable[[str, str, int, int], None]
@@ -20,10 +24,9 @@ DiscoverFn = Callable[[Path], list[Path]]
 DeviceFn = Callable[[str], Any]
 LoadModelFn = Callable[[Any], Any]
 ExtractFn = Callable[..., tuple[np.ndarray, list[int]]]
-SimilarityFn = Callable[[np.ndarray], np.ndarray]
-DistanceFn = Callable[[np.ndarray, float], np.ndarray]
+CondensedDistanceFn = Callable[[np.ndarray, float], np.ndarray]
 ClusterFn = Callable[[np.ndarray, float, str], Any]
-BuildOrderFn = Callable[..., list[OrderedPhoto]]
+BuildOrderFn = Callable[..., Sequence[OrderedPhoto]]
 OutputFn = Callable[..., None]
 
 # Valid values for categorical parameters
@@ -109,6 +112,43 @@ def validate_pipeline_parameters(
         )
 
 
+_OPTIONAL_EXTRACT_KWARGS = ("on_batch", "preprocess", "cache_dir")
+_OPTIONAL_DISTANCE_KWARGS = ("device",)
+
+
+def _probe_extract_kwargs(extract_embeddings_fn: ExtractFn) -> frozenset[str]:
+    """Return which optional keyword arguments *extract_embeddings_fn* accepts."""
+    return _probe_optional_kwargs(extract_embeddings_fn, _OPTIONAL_EXTRACT_KWARGS)
+
+
+def _probe_optional_kwargs(fn: Callable, names: tuple[str, ...]) -> frozenset[str]:
+    """Return which of *names* the injected callable *fn* accepts.
+
+    The ``inspect.signature`` walk is memoized per function object, so
+    long-lived callers (the GUI bridge) probe each callable only once.
+    """
+    try:
+        return _probe_optional_kwargs_cached(fn, names)
+    except TypeError:
+        # Unhashable callable: probe without the cache.
+        return _probe_optional_kwargs_cached.__wrapped__(fn, names)
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_optional_kwargs_cached(fn: Callable, names: tuple[str, ...]) -> frozenset[str]:
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        # Some callables (e.g. C-extensions or heavily wrapped functions) may not
+        # expose a signature. In that case, use the basic call path.
+        return frozenset()
+    return frozenset(name for name in names if name in params)
+
+
+def _noop_progress(step: str, detail: str, processed: int, total: int) -> None:
+    pass
+
+
 @dataclass(frozen=True)
 class PipelineOutcome:
     manifest_path: Path
@@ -123,19 +163,21 @@ def run_pipeline_shared(
     detect_device_fn: DeviceFn,
     load_model_fn: LoadModelFn,
     extract_embeddings_fn: ExtractFn,
-    compute_similarity_matrix_fn: SimilarityFn,
-    compute_distance_matrix_fn: DistanceFn,
+    compute_condensed_distance_fn: CondensedDistanceFn,
     cluster_fn: ClusterFn,
     build_ordered_sequence_fn: BuildOrderFn,
     output_manifest_fn: OutputFn,
     on_progress: ProgressCallback | None = None,
     log: logging.Logger | None = None,
 ) -> PipelineOutcome:
+    """Run discover → embed → distance → cluster → manifest.
+
+    *compute_condensed_distance_fn* returns the condensed upper triangle
+    of the distance matrix, which goes straight to *cluster_fn*.
+    """
     logger = log or logging.getLogger("photosorter")
 
-    def emit(step: str, detail: str, processed: int = 0, total: int = 0) -> None:
-        if on_progress is not None:
-            on_progress(step, detail, processed, total)
+    emit = on_progress if on_progress is not None else _noop_progress
 
     device = params.device
     batch_size = params.batch_size
@@ -150,7 +192,7 @@ def run_pipeline_shared(
         raise FileNotFoundError(f"Input directory does not exist: {input_dir}")
 
     # Step 1 — discover images
-    emit("discover", "Discovering images…")
+    emit("discover", "Discovering images…", 0, 0)
     paths = discover_images_fn(input_dir)
     if not paths:
         raise FileNotFoundError(f"No images found in {input_dir}")
@@ -158,10 +200,10 @@ def run_pipeline_shared(
     emit("discover", f"Found {len(paths)} images", len(paths), len(paths))
 
     # Step 2 — load model
-    emit("model", "Loading DINOv3 model…")
+    emit("model", "Loading DINOv3 model…", 0, 0)
     resolved_device = detect_device_fn(device)
     model = load_model_fn(resolved_device)
-    emit("model", "Model loaded")
+    emit("model", "Model loaded", 0, 0)
 
     # Step 3 — extract embeddings
     total_images = len(paths)
@@ -170,23 +212,16 @@ def run_pipeline_shared(
     def _on_batch(processed: int, total: int) -> None:
         emit("embed", f"{processed}/{total}", processed, total)
 
-    has_on_batch = False
-    has_preprocess = False
-    try:
-        extract_params = inspect.signature(extract_embeddings_fn).parameters
-        has_on_batch = "on_batch" in extract_params
-        has_preprocess = "preprocess" in extract_params
-    except (TypeError, ValueError):
-        # Some callables (e.g. C-extensions or heavily wrapped functions) may not
-        # expose a signature. In that case, use the basic call path.
-        has_on_batch = False
-        has_preprocess = False
-
+    supported = _probe_extract_kwargs(extract_embeddings_fn)
     extract_kwargs: dict[str, Any] = {}
-    if has_on_batch:
+    # Without a progress listener, skip the per-batch callback (and its
+    # detail string) entirely.
+    if "on_batch" in supported and on_progress is not None:
         extract_kwargs["on_batch"] = _on_batch
-    if has_preprocess:
+    if "preprocess" in supported:
         extract_kwargs["preprocess"] = preprocess
+    if "cache_dir" in supported:
+        extract_kwargs["cache_dir"] = embedding_cache_dir_for_input(input_dir)
 
     embeddings, valid_indices = extract_embeddings_fn(
         paths,
@@ -199,23 +234,33 @@ def run_pipeline_shared(
     if len(valid_indices) < len(paths):
         skipped = len(paths) - len(valid_indices)
         logger.warning("Skipped %d unreadable images", skipped)
-        paths = [paths[i] for i in valid_indices]
+        # One C-level gather over an object array instead of a per-path
+        # Python index; handed on as a plain list.
+        paths = np.asarray(paths, dtype=object)[
+            np.asarray(valid_indices, dtype=np.intp)
+        ].tolist()
 
     emit("embed", "Embeddings extracted", total_images, total_images)
 
     # Step 4 — similarity & distance
-    emit("similarity", "Computing similarity matrix…")
-    sim = compute_similarity_matrix_fn(embeddings)
-    dist = compute_distance_matrix_fn(sim, temporal_weight)
-    emit("similarity", "Distance matrix ready")
+    emit("similarity", "Computing similarity matrix…", 0, 0)
+    distance_kwargs: dict[str, Any] = {}
+    if "device" in _probe_optional_kwargs(
+        compute_condensed_distance_fn, _OPTIONAL_DISTANCE_KWARGS,
+    ):
+        distance_kwargs["device"] = resolved_device
+    dist = compute_condensed_distance_fn(
+        embeddings, temporal_weight, **distance_kwargs,
+    )
+    emit("similarity", "Distance matrix ready", 0, 0)
 
     # Step 5 — clustering
-    emit("cluster", "Clustering…")
+    emit("cluster", "Clustering…", 0, 0)
     result = cluster_fn(dist, distance_threshold, linkage)
-    emit("cluster", f"{result.n_clusters} clusters found")
+    emit("cluster", f"{result.n_clusters} clusters found", 0, 0)
 
     # Step 6 — write manifest
-    emit("output", "Writing manifest…")
+    emit("output", "Writing manifest…", 0, 0)
     ordered = build_ordered_sequence_fn(
         paths,
         result.labels,
@@ -234,7 +279,7 @@ def run_pipeline_shared(
         batch_size=batch_size,
         device=str(resolved_device),
     )
-    emit("output", "Manifest written")
+    emit("output", "Manifest written", 0, 0)
 
     return PipelineOutcome(
         manifest_path=manifest_path,
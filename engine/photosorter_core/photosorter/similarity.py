@@ -1,10 +1,17 @@
 """Similarity and distance matrix computation."""
 
+from collections.abc import Iterator
+from typing import Any
+
 import numpy as np
+import torch
 
 
 def compute_similarity_matrix(embeddings: np.ndarray) -> np.ndarray:
-    """Cosine similarity via dot product (embeddings are L2-normalised)."""
+    """Cosine similarity via dot product (embeddings are L2-normalised).
+
+    A single BLAS GEMM; no per-row Python work.
+    """
     return embeddings @ embeddings.T
 
 
@@ -12,13 +19,97 @@ def compute_distance_matrix(
     similarity: np.ndarray,
     temporal_weight: float = 0.0,
 ) -> np.ndarray:
-    """Convert similarity to distance, optionally adding temporal penalty."""
-    dist = np.clip(1.0 - similarity, 0.0, 2.0)
+    """Convert similarity to distance, optionally adding temporal penalty.
+
+    Works in a single N x N output buffer (clip and temporal penalty are
+    applied in place) and keeps the input dtype, so float32 similarity
+    stays float32.
+    """
+    dist = np.subtract(1.0, similarity)
+    np.clip(dist, 0.0, 2.0, out=dist)
 
     if temporal_weight > 0.0:
         n = dist.shape[0]
-        indices = np.arange(n)
-        temporal = np.abs(indices[:, None] - indices[None, :]) / max(n - 1, 1)
-        dist = dist + temporal_weight * temporal
+        indices = np.arange(n, dtype=dist.dtype)
+        temporal = np.abs(np.subtract.outer(indices, indices))
+        temporal *= temporal_weight / max(n - 1, 1)
+        dist += temporal
 
     return dist
+
+
+# Rows per GEMM tile in compute_condensed_distance: bounds the scratch
+# buffer to block_rows x N instead of a full N x N matrix.
+_CONDENSED_BLOCK_ROWS = 1024
+# Devices whose GEMM beats host BLAS by enough to pay for copying the
+# tiles back.
+_ACCELERATOR_DEVICE_TYPES = frozenset({"cuda", "mps"})
+
+
+def compute_condensed_distance(
+    embeddings: np.ndarray,
+    temporal_weight: float = 0.0,
+    *,
+    block_rows: int = _CONDENSED_BLOCK_ROWS,
+    device: Any = None,
+) -> np.ndarray:
+    """Condensed form of ``compute_distance_matrix(compute_similarity_matrix(e))``.
+
+    Returns the upper triangle (``i < j``) in ``squareform`` order, length
+    N*(N-1)/2, without materializing either N x N matrix: similarities
+    are computed one row block at a time against the columns at or past
+    the block, and only the ``j > i`` entries are kept.
+
+    With a CUDA/MPS *device*, float32 tiles are multiplied there and
+    copied back one at a time; otherwise host BLAS is used.
+    """
+    n = embeddings.shape[0]
+    out = np.empty(n * (n - 1) // 2, dtype=np.result_type(embeddings.dtype, np.float32))
+    if n < 2:
+        return out
+
+    if (
+        getattr(device, "type", device) in _ACCELERATOR_DEVICE_TYPES
+        and embeddings.dtype == np.float32
+    ):
+        tiles = _device_distance_tiles(embeddings, block_rows, device)
+    else:
+        tiles = _host_distance_tiles(embeddings, block_rows)
+
+    temporal_scale = temporal_weight / max(n - 1, 1)
+    pos = 0
+    for tile in tiles:
+        # Row i of the tile holds distances from photo start+i to photos
+        # start..n-1; its j > i part is what the condensed vector needs.
+        for i in range(tile.shape[0]):
+            row = tile[i, i + 1:]
+            if temporal_weight > 0.0:
+                row += np.arange(1, len(row) + 1, dtype=row.dtype) * temporal_scale
+            out[pos:pos + len(row)] = row
+            pos += len(row)
+    return out
+
+
+def _host_distance_tiles(embeddings: np.ndarray, block_rows: int) -> Iterator[np.ndarray]:
+    n = embeddings.shape[0]
+    for start in range(0, n - 1, block_rows):
+        stop = min(start + block_rows, n - 1)
+        tile = embeddings[start:stop] @ embeddings[start:].T
+        np.subtract(1.0, tile, out=tile)
+        np.clip(tile, 0.0, 2.0, out=tile)
+        yield tile
+
+
+def _device_distance_tiles(
+    embeddings: np.ndarray,
+    block_rows: int,
+    device: torch.device,
+) -> Iterator[np.ndarray]:
+    emb = torch.from_numpy(embeddings).to(device)
+    n = emb.shape[0]
+    with torch.inference_mode():
+        for start in range(0, n - 1, block_rows):
+            stop = min(start + block_rows, n - 1)
+            tile = emb[start:stop] @ emb[start:].T
+            tile.neg_().add_(1.0).clamp_(0.0, 2.0)
+            yield tile.cpu().numpy()
@@ -1,9 +1,11 @@
-"""Utility helpers: logging, natural sort, image discovery."""
+"""Utility helpers: logging, natural sort, image discovery, path resolution."""
 
 from __future__ import annotations
 
 import logging
+import os
 import re
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Union
 
@@ -37,18 +39,49 @@ def ensure_logging() -> None:
         setup_logging()
 
 
+_DIGIT_GROUPS_RE = re.compile(r"(\d+)")
+
+
 def natural_sort_key(path: Path) -> list[Union[int, str]]:
     """Split filename on digit groups so 1-2 sorts before 1-10."""
-    parts = re.split(r"(\d+)", path.stem)
-    return [int(p) if p.isdigit() else p.lower() for p in parts]
+    # A capturing split alternates text/digits, so odd slots are always
+    # digit groups and no per-part isdigit() check is needed.
+    parts: list[Union[int, str]] = _DIGIT_GROUPS_RE.split(path.stem.lower())
+    parts[1::2] = map(int, parts[1::2])
+    return parts
+
+
+_SUPPORTED_EXTENSIONS = frozenset(
+    ext.lower() for ext in DEFAULTS.image_extensions + DEFAULTS.raw_extensions
+)
 
 
 def discover_images(input_dir: Path) -> list[Path]:
     """Find all supported images in *input_dir*, naturally sorted."""
-    extensions = DEFAULTS.image_extensions + DEFAULTS.raw_extensions
-    images = [
-        p for p in input_dir.iterdir()
-        if p.is_file() and p.suffix.lower() in extensions
-    ]
+    # Filter on the name first; DirEntry.is_file() then answers from the
+    # readdir data for regular files instead of a stat() per entry.
+    with os.scandir(input_dir) as entries:
+        images = [
+            input_dir / entry.name for entry in entries
+            if os.path.splitext(entry.name)[1].lower() in _SUPPORTED_EXTENSIONS
+            and entry.is_file()
+        ]
     images.sort(key=natural_sort_key)
     return images
+
+
+def resolve_paths(paths: Iterable[Path]) -> list[str]:
+    """Absolute path strings, resolving each distinct parent directory once.
+
+    Photos normally share one folder, so this is a single ``realpath``
+    instead of one per photo.
+    """
+    resolved_dirs: dict[Path, str] = {}
+    out: list[str] = []
+    for path in paths:
+        parent = path.parent
+        resolved = resolved_dirs.get(parent)
+        if resolved is None:
+            resolved = resolved_dirs[parent] = str(parent.resolve())
+        out.append(os.path.join(resolved, path.name))
+    return out
@@ -21,6 +21,12 @@ from photosorter.config import DEFAULTS
 from photosorter.pipeline import PipelineArgumentError, PipelineParams
 
 
+@pytest.fixture(scope="module")
+def default_params(tmp_path_factory) -> PipelineParams:
+    """Params built from an empty GUI dict, shared across this module."""
+    return build_pipeline_params(str(tmp_path_factory.mktemp("defaults")), {})
+
+
 class TestBuildPipelineParamsFromGUI:
     """Test the GUI parameter dict → PipelineParams conversion.
 
@@ -28,15 +34,14 @@ class TestBuildPipelineParamsFromGUI:
     ParameterView rely on when launching the pipeline subprocess.
     """
 
-    def test_empty_parameters_use_defaults(self, tmp_path):
-        params = build_pipeline_params(str(tmp_path), {})
-        assert params.device == "auto"
-        assert params.batch_size == DEFAULTS.batch_size
-        assert params.pooling == DEFAULTS.pooling
-        assert params.preprocess == DEFAULTS.preprocess
-        assert params.distance_threshold == DEFAULTS.distance_threshold
-        assert params.linkage == DEFAULTS.linkage
-        assert params.temporal_weight == DEFAULTS.temporal_weight
+    def test_empty_parameters_use_defaults(self, default_params):
+        assert default_params.device == "auto"
+        assert default_params.batch_size == DEFAULTS.batch_size
+        assert default_params.pooling == DEFAULTS.pooling
+        assert default_params.preprocess == DEFAULTS.preprocess
+        assert default_params.distance_threshold == DEFAULTS.distance_threshold
+        assert default_params.linkage == DEFAULTS.linkage
+        assert default_params.temporal_weight == DEFAULTS.temporal_weight
 
     def test_gui_display_labels_map_to_python_values(self, tmp_path):
         """Swift sends display labels like 'Apple GPU'; bridge must map them."""
@@ -71,33 +76,21 @@ class TestBuildPipelineParamsFromGUI:
         assert params.preprocess == "letterbox"
         assert params.linkage == "single"
 
-    def test_auto_device_label_maps_to_auto(self, tmp_path):
-        params = build_pipeline_params(str(tmp_path), {"device": "Auto"})
-        assert params.device == "auto"
-
-    def test_cpu_display_label_maps_to_cpu(self, tmp_path):
-        params = build_pipeline_params(str(tmp_path), {"device": "CPU"})
-        assert params.device == "cpu"
-
-    def test_cls_display_label_maps_to_cls(self, tmp_path):
-        params = build_pipeline_params(str(tmp_path), {"pooling": "CLS"})
-        assert params.pooling == "cls"
-
-    def test_avg_display_label_maps_to_avg(self, tmp_path):
-        params = build_pipeline_params(str(tmp_path), {"pooling": "AVG"})
-        assert params.pooling == "avg"
-
-    def test_timm_preprocess_display_label_maps_to_timm(self, tmp_path):
-        params = build_pipeline_params(str(tmp_path), {"preprocess": "TIMM (strict)"})
-        assert params.preprocess == "timm"
-
-    def test_average_display_label_maps_to_average(self, tmp_path):
-        params = build_pipeline_params(str(tmp_path), {"linkage": "Average"})
-        assert params.linkage == "average"
-
-    def test_single_display_label_maps_to_single(self, tmp_path):
-        params = build_pipeline_params(str(tmp_path), {"linkage": "Single"})
-        assert params.linkage == "single"
+    @pytest.mark.parametrize(
+        ("key", "label", "expected"),
+        [
+            ("device", "Auto", "auto"),
+            ("device", "CPU", "cpu"),
+            ("pooling", "CLS", "cls"),
+            ("pooling", "AVG", "avg"),
+            ("preprocess", "TIMM (strict)", "timm"),
+            ("linkage", "Average", "average"),
+            ("linkage", "Single", "single"),
+        ],
+    )
+    def test_display_label_maps_to_python_value(self, tmp_path, key, label, expected):
+        params = build_pipeline_params(str(tmp_path), {key: label})
+        assert getattr(params, key) == expected
 
     def test_parameters_from_manifest_round_trip(self, tmp_path):
         """Parameters stored in manifest can be fed back to build_pipeline_params."""
@@ -123,29 +116,20 @@ class TestBuildPipelineParamsFromGUI:
 class TestGUIParameterValidation:
     """Test that invalid GUI parameters are caught before pipeline runs."""
 
-    def test_invalid_threshold_zero(self, tmp_path):
-        with pytest.raises(PipelineArgumentError, match="--distance-threshold must be > 0"):
-            build_pipeline_params(str(tmp_path), {"distance_threshold": 0.0})
-
-    def test_invalid_threshold_negative(self, tmp_path):
-        with pytest.raises(PipelineArgumentError, match="--distance-threshold must be > 0"):
-            build_pipeline_params(str(tmp_path), {"distance_threshold": -0.5})
-
-    def test_invalid_threshold_too_large(self, tmp_path):
-        with pytest.raises(PipelineArgumentError, match="--distance-threshold must be <= 2.0"):
-            build_pipeline_params(str(tmp_path), {"distance_threshold": 2.5})
-
-    def test_invalid_temporal_weight_negative(self, tmp_path):
-        with pytest.raises(PipelineArgumentError, match="--temporal-weight must be >= 0"):
-            build_pipeline_params(str(tmp_path), {"temporal_weight": -0.1})
-
-    def test_invalid_batch_size_zero(self, tmp_path):
-        with pytest.raises(PipelineArgumentError, match="--batch-size must be >= 1"):
-            build_pipeline_params(str(tmp_path), {"batch_size": 0})
-
-    def test_invalid_preprocess(self, tmp_path):
-        with pytest.raises(PipelineArgumentError, match="--preprocess must be one of"):
-            build_pipeline_params(str(tmp_path), {"preprocess": "crop"})
+    @pytest.mark.parametrize(
+        ("params", "match"),
+        [
+            ({"distance_threshold": 0.0}, "--distance-threshold must be > 0"),
+            ({"distance_threshold": -0.5}, "--distance-threshold must be > 0"),
+            ({"distance_threshold": 2.5}, "--distance-threshold must be <= 2.0"),
+            ({"temporal_weight": -0.1}, "--temporal-weight must be >= 0"),
+            ({"batch_size": 0}, "--batch-size must be >= 1"),
+            ({"preprocess": "crop"}, "--preprocess must be one of"),
+        ],
+    )
+    def test_invalid_parameter_rejected(self, tmp_path, params, match):
+        with pytest.raises(PipelineArgumentError, match=match):
+            build_pipeline_params(str(tmp_path), params)
 
 
 class TestStepOrdering:
@@ -11,6 +11,7 @@ import pytest
 
 from photosorter_bridge import cli_json
 from photosorter_bridge.pipeline_runner import StepInfo
+from photosorter import _json
 from photosorter.cache_paths import manifest_path_for_input
 from photosorter.config import DEFAULTS
 from photosorter.pipeline import PipelineOutcome, PipelineParams
@@ -56,6 +57,35 @@ def test_emit_writes_json_line_and_flushes(monkeypatch):
     assert flush_calls["count"] == 1
 
 
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_emit_writes_bytes_to_stdout_buffer(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(_json, "orjson", None)
+    raw = io.BytesIO()
+    flush_calls = {"count": 0}
+
+    class _BufferProxy:
+        def write(self, data: bytes) -> int:
+            return raw.write(data)
+
+        def flush(self) -> None:
+            flush_calls["count"] += 1
+
+    class _StdoutProxy:
+        buffer = _BufferProxy()
+
+    monkeypatch.setattr(cli_json.sys, "stdout", _StdoutProxy())
+
+    cli_json._emit({"type": "x", "path": Path("/tmp/é.jpg")})
+
+    line = raw.getvalue()
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert json.loads(line) == {"type": "x", "path": "/tmp/é.jpg"}
+    assert flush_calls["count"] == 1
+
+
 def test_on_progress_emits_expected_payload(monkeypatch):
     emitted: list[dict] = []
     monkeypatch.setattr(cli_json, "_emit", lambda obj: emitted.append(obj))
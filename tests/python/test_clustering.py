@@ -14,13 +14,9 @@ def _make_block_distance(groups: list[int], intra: float = 0.1, inter: float = 0
         intra: distance between points in the same group
         inter: distance between points in different groups
     """
-    n = len(groups)
-    dist = np.full((n, n), inter, dtype=np.float64)
-    for i in range(n):
-        for j in range(n):
-            if groups[i] == groups[j]:
-                dist[i, j] = intra
-        dist[i, i] = 0.0
+    g = np.asarray(groups)
+    dist = np.where(g[:, None] == g[None, :], intra, inter).astype(np.float64)
+    np.fill_diagonal(dist, 0.0)
     return dist
 
 
@@ -94,3 +90,28 @@ class TestCluster:
         result = cluster(dist, distance_threshold=0.5)
 
         assert len(result.labels) == len(groups)
+
+    def test_float32_input_gives_zero_based_contiguous_labels(self):
+        groups = [0, 0, 1, 1, 2]
+        dist = _make_block_distance(groups).astype(np.float32)
+        result = cluster(dist, distance_threshold=0.5)
+
+        assert result.n_clusters == 3
+        assert sorted(set(result.labels.tolist())) == [0, 1, 2]
+
+    def test_condensed_input_matches_square_input(self):
+        from scipy.spatial.distance import squareform
+
+        groups = [0, 0, 1, 1, 1, 2]
+        dist = _make_block_distance(groups)
+        square = cluster(dist, distance_threshold=0.5)
+        condensed = cluster(squareform(dist, checks=False), distance_threshold=0.5)
+
+        assert condensed.n_clusters == square.n_clusters == 3
+        np.testing.assert_array_equal(condensed.labels, square.labels)
+
+    def test_empty_condensed_input_is_single_photo(self):
+        result = cluster(np.zeros(0), distance_threshold=0.5)
+
+        assert result.n_clusters == 1
+        assert result.labels.tolist() == [0]
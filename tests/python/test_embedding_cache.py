@@ -0,0 +1,184 @@
+"""Tests for photosorter.embedding_cache — on-disk embedding reuse."""
+
+import json
+
+import numpy as np
+import pytest
+
+from photosorter import _json
+from photosorter.embedding_cache import (
+    DATA_FILENAME,
+    INDEX_FILENAME,
+    EmbeddingCache,
+    cache_key,
+    cache_keys,
+)
+
+
+def _cache(tmp_path, **overrides):
+    settings = {
+        "model_id": "model-a",
+        "preprocess": "letterbox",
+        "pooling": "avg",
+        "device": "cpu",
+        "precision": "fp32",
+    }
+    settings.update(overrides)
+    return EmbeddingCache(tmp_path / "cache", **settings)
+
+
+def _files(tmp_path, names):
+    paths = []
+    for name in names:
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        paths.append(path)
+    return paths
+
+
+class TestCacheKey:
+    def test_changes_with_content(self, tmp_path):
+        (path,) = _files(tmp_path, ["a.jpg"])
+        before = cache_key(path)
+        path.write_bytes(b"different length")
+        assert cache_key(path) != before
+
+    def test_missing_file_returns_none(self, tmp_path):
+        assert cache_key(tmp_path / "missing.jpg") is None
+
+    def test_batch_keys_resolve_each_folder_once(self, tmp_path, monkeypatch):
+        paths = _files(tmp_path, ["a.jpg", "b.jpg"])
+        paths.insert(1, tmp_path / "missing.jpg")
+        expected = [cache_key(p) for p in paths]
+
+        calls = []
+        real_resolve = type(tmp_path).resolve
+
+        def counting_resolve(self, *args, **kwargs):
+            calls.append(self)
+            return real_resolve(self, *args, **kwargs)
+
+        monkeypatch.setattr(type(tmp_path), "resolve", counting_resolve)
+        assert cache_keys(paths) == expected
+        assert calls == [tmp_path]
+
+
+class TestEmbeddingCache:
+    def test_round_trip(self, tmp_path):
+        keys = [cache_key(p) for p in _files(tmp_path, ["a.jpg", "b.jpg"])]
+        emb = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+
+        cache = _cache(tmp_path)
+        assert cache.get_many(keys) == ([], None)
+        cache.put_many(keys, emb)
+        cache.flush()
+
+        positions, cached = _cache(tmp_path).get_many(keys)
+        assert positions == [0, 1]
+        np.testing.assert_array_equal(cached, emb)
+
+    def test_partial_hits_report_positions(self, tmp_path):
+        keys = [cache_key(p) for p in _files(tmp_path, ["a.jpg", "b.jpg", "c.jpg"])]
+        cache = _cache(tmp_path)
+        cache.put_many([keys[2]], np.array([[0.5, 0.5]], dtype=np.float32))
+        cache.flush()
+
+        positions, cached = _cache(tmp_path).get_many(keys)
+        assert positions == [2]
+        np.testing.assert_array_equal(cached, [[0.5, 0.5]])
+
+    def test_appends_across_runs(self, tmp_path):
+        keys = [cache_key(p) for p in _files(tmp_path, ["a.jpg", "b.jpg"])]
+        first = _cache(tmp_path)
+        first.put_many([keys[0]], np.array([[1.0, 2.0]], dtype=np.float32))
+        first.flush()
+
+        second = _cache(tmp_path)
+        second.get_many(keys)
+        second.put_many([keys[1]], np.array([[3.0, 4.0]], dtype=np.float32))
+        second.flush()
+
+        positions, cached = _cache(tmp_path).get_many(keys)
+        assert positions == [0, 1]
+        np.testing.assert_array_equal(cached, [[1.0, 2.0], [3.0, 4.0]])
+
+    def test_settings_change_invalidates(self, tmp_path):
+        keys = [cache_key(p) for p in _files(tmp_path, ["a.jpg"])]
+        cache = _cache(tmp_path)
+        cache.put_many(keys, np.ones((1, 2), dtype=np.float32))
+        cache.flush()
+
+        assert _cache(tmp_path, pooling="cls").get_many(keys) == ([], None)
+        assert _cache(tmp_path, model_id="model-b").get_many(keys) == ([], None)
+
+    @pytest.mark.parametrize(
+        "overrides", [{"device": "mps"}, {"precision": "fp16"}],
+    )
+    def test_device_or_precision_change_invalidates(self, tmp_path, overrides):
+        keys = [cache_key(p) for p in _files(tmp_path, ["a.jpg"])]
+        cache = _cache(tmp_path)
+        cache.put_many(keys, np.ones((1, 2), dtype=np.float32))
+        cache.flush()
+
+        assert _cache(tmp_path, **overrides).get_many(keys) == ([], None)
+        assert _cache(tmp_path).get_many(keys)[0] == [0]
+
+    def test_unused_entries_are_dropped_and_compacted(self, tmp_path):
+        keys = [cache_key(p) for p in _files(tmp_path, ["a.jpg", "b.jpg", "c.jpg"])]
+        cache = _cache(tmp_path)
+        cache.put_many(keys, np.arange(6, dtype=np.float32).reshape(3, 2))
+        cache.flush()
+
+        # Only c.jpg is still part of the folder.
+        survivor = _cache(tmp_path)
+        survivor.get_many([keys[2]])
+        survivor.flush()
+
+        data = np.fromfile(tmp_path / "cache" / DATA_FILENAME, dtype=np.float32)
+        np.testing.assert_array_equal(data, [4.0, 5.0])
+        positions, cached = _cache(tmp_path).get_many(keys)
+        assert positions == [2]
+        np.testing.assert_array_equal(cached, [[4.0, 5.0]])
+
+    def test_rows_past_end_of_data_are_misses(self, tmp_path):
+        keys = [cache_key(p) for p in _files(tmp_path, ["a.jpg", "b.jpg"])]
+        cache = _cache(tmp_path)
+        cache.put_many(keys, np.ones((2, 2), dtype=np.float32))
+        cache.flush()
+
+        data_path = tmp_path / "cache" / DATA_FILENAME
+        data_path.write_bytes(data_path.read_bytes()[:8])
+
+        positions, _ = _cache(tmp_path).get_many(keys)
+        assert positions == [0]
+
+    def test_corrupt_index_is_ignored(self, tmp_path):
+        keys = [cache_key(p) for p in _files(tmp_path, ["a.jpg"])]
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        (cache_dir / INDEX_FILENAME).write_text("{not json")
+        (cache_dir / DATA_FILENAME).write_bytes(b"")
+
+        cache = _cache(tmp_path)
+        assert cache.get_many(keys) == ([], None)
+        cache.put_many(keys, np.ones((1, 2), dtype=np.float32))
+        cache.flush()
+
+        index = json.loads((cache_dir / INDEX_FILENAME).read_text())
+        assert list(index["rows"]) == keys
+
+    @pytest.mark.parametrize("write_with_orjson", [True, False])
+    def test_index_is_portable_between_json_backends(self, tmp_path, monkeypatch, write_with_orjson):
+        pytest.importorskip("orjson")
+        orjson_mod = _json.orjson
+        keys = [cache_key(p) for p in _files(tmp_path, ["a.jpg"])]
+
+        monkeypatch.setattr(_json, "orjson", orjson_mod if write_with_orjson else None)
+        cache = _cache(tmp_path)
+        cache.put_many(keys, np.ones((1, 2), dtype=np.float32))
+        cache.flush()
+
+        monkeypatch.setattr(_json, "orjson", None if write_with_orjson else orjson_mod)
+        positions, cached = _cache(tmp_path).get_many(keys)
+        assert positions == [0]
+        np.testing.assert_array_equal(cached, [[1.0, 1.0]])
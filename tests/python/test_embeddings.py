@@ -21,13 +21,23 @@ from photosorter.config import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _clear_model_cache():
+    emb_mod.load_model.cache_clear()
+    yield
+    emb_mod.load_model.cache_clear()
+
+
 class _DummyModel:
     def __init__(self):
         self.moved_to = None
         self.eval_called = False
 
-    def to(self, device):
-        self.moved_to = device
+    def to(self, device=None, memory_format=None):
+        if device is not None:
+            self.moved_to = device
+        if memory_format is not None:
+            self.memory_format = memory_format
         return self
 
     def eval(self):
@@ -145,6 +155,84 @@ def test_load_model_falls_back_to_remote_when_local_missing(monkeypatch):
     assert model.eval_called is True
 
 
+def test_load_model_reuses_model_for_same_device(monkeypatch):
+    created = []
+
+    def fake_create_model(model_id, pretrained):
+        created.append(_DummyModel())
+        return created[-1]
+
+    monkeypatch.delenv(MODEL_OFFLINE_ENV, raising=False)
+    monkeypatch.setattr(emb_mod, "_resolve_local_model_checkpoint", lambda: None)
+    monkeypatch.setattr(emb_mod.timm, "create_model", fake_create_model)
+
+    first = emb_mod.load_model(torch.device("cpu"))
+    assert emb_mod.load_model(torch.device("cpu")) is first
+    assert len(created) == 1
+
+    emb_mod.load_model(torch.device("meta"))
+    assert len(created) == 2
+    assert emb_mod.load_model(torch.device("cpu")) is not first
+
+
+def test_load_model_compiles_forward_on_cuda_only(monkeypatch):
+    class _ForwardModel(_DummyModel):
+        def forward_features(self, batch):
+            return batch
+
+    compiled = []
+
+    def compiled_forward(batch):
+        return batch * 2
+
+    def fake_compile(fn, **kwargs):
+        compiled.append(kwargs)
+        return compiled_forward
+
+    monkeypatch.delenv(MODEL_OFFLINE_ENV, raising=False)
+    monkeypatch.setattr(emb_mod, "_resolve_local_model_checkpoint", lambda: None)
+    monkeypatch.setattr(emb_mod.timm, "create_model", lambda *_a, **_k: _ForwardModel())
+    monkeypatch.setattr(emb_mod.torch, "compile", fake_compile)
+
+    cpu_model = emb_mod.load_model(torch.device("cpu"))
+    assert compiled == []
+    assert cpu_model.forward_features(3) == 3
+
+    cuda_model = emb_mod.load_model(torch.device("cuda"))
+    assert compiled == [{"mode": "reduce-overhead", "dynamic": False}]
+    assert cuda_model.forward_features(3) == 6
+    # After the first successful call the compiled forward is used directly.
+    assert cuda_model.forward_features is compiled_forward
+
+
+def test_compile_forward_falls_back_to_eager_when_first_call_fails(monkeypatch):
+    class _ForwardModel:
+        def forward_features(self, batch):
+            return batch
+
+    def failing_forward(_batch):
+        raise RuntimeError("Cannot find a working triton installation")
+
+    monkeypatch.setattr(emb_mod.torch, "compile", lambda fn, **_k: failing_forward)
+    model = emb_mod._compile_forward(_ForwardModel(), torch.device("cuda"))
+
+    assert model.forward_features(5) == 5
+    assert model.forward_features.__func__ is _ForwardModel.forward_features
+
+
+def test_load_model_uses_channels_last_on_cuda_only(monkeypatch):
+    monkeypatch.delenv(MODEL_OFFLINE_ENV, raising=False)
+    monkeypatch.setattr(emb_mod, "_resolve_local_model_checkpoint", lambda: None)
+    monkeypatch.setattr(emb_mod.timm, "create_model", lambda *_a, **_k: _DummyModel())
+    monkeypatch.setattr(emb_mod, "_compile_forward", lambda model, _device: model)
+
+    cpu_model = emb_mod.load_model(torch.device("cpu"))
+    assert not hasattr(cpu_model, "memory_format")
+
+    cuda_model = emb_mod.load_model(torch.device("cuda"))
+    assert cuda_model.memory_format == torch.channels_last
+
+
 def test_load_model_offline_requires_local_checkpoint(monkeypatch):
     monkeypatch.setattr(emb_mod, "_resolve_local_model_checkpoint", lambda: None)
     monkeypatch.setenv(MODEL_OFFLINE_ENV, "1")
@@ -179,8 +267,7 @@ def test_build_transform_shape_and_normalization():
     assert isinstance(tfm, transforms.Compose)
     assert [type(op).__name__ for op in tfm.transforms] == [
         "ResizeAndPadToSquare",
-        "ToTensor",
-        "Normalize",
+        "ToNormalizedTensor",
     ]
     assert tfm.transforms[0].size == DEFAULTS.crop_size
     norm = tfm.transforms[-1]
@@ -188,6 +275,51 @@ def test_build_transform_shape_and_normalization():
     assert tuple(norm.std) == DEFAULTS.imagenet_std
 
 
+def test_to_normalized_tensor_matches_torchvision():
+    rng = np.random.default_rng(0)
+    img = Image.fromarray(rng.integers(0, 256, (7, 5, 3), dtype=np.uint8))
+    reference = transforms.Compose([
+        transforms.ToTensor(),
+        transforms.Normalize(
+            mean=list(DEFAULTS.imagenet_mean),
+            std=list(DEFAULTS.imagenet_std),
+        ),
+    ])(img)
+
+    out = emb_mod.ToNormalizedTensor(DEFAULTS.imagenet_mean, DEFAULTS.imagenet_std)(img)
+
+    assert out.dtype == torch.float32
+    assert out.shape == (3, 7, 5)
+    assert out.is_contiguous()
+    assert torch.allclose(out, reference, atol=1e-5)
+
+
+def test_fuse_to_normalized_tensor_matches_timm_pipeline():
+    from timm.data import create_transform
+
+    reference = create_transform(
+        input_size=(3, 16, 16),
+        interpolation="bicubic",
+        mean=DEFAULTS.imagenet_mean,
+        std=DEFAULTS.imagenet_std,
+        crop_pct=1.0,
+        is_training=False,
+    )
+    fused = emb_mod._fuse_to_normalized_tensor(reference)
+    rng = np.random.default_rng(1)
+    img = Image.fromarray(rng.integers(0, 256, (20, 24, 3), dtype=np.uint8))
+
+    assert type(fused.transforms[-1]).__name__ == "ToNormalizedTensor"
+    assert len(fused.transforms) == len(reference.transforms) - 1
+    assert torch.allclose(fused(img), reference(img), atol=1e-5)
+
+
+def test_fuse_to_normalized_tensor_leaves_other_pipelines():
+    other = transforms.Compose([transforms.ToTensor()])
+    assert emb_mod._fuse_to_normalized_tensor(other) is other
+    assert emb_mod._fuse_to_normalized_tensor("timm-transform") == "timm-transform"
+
+
 def test_build_transform_for_mode_timm_uses_timm_factory(monkeypatch):
     fake_model = object()
     seen = {}
@@ -212,6 +344,29 @@ def test_build_transform_for_mode_timm_uses_timm_factory(monkeypatch):
     assert seen["is_training"] is False
 
 
+def test_build_transform_for_mode_caches_per_model(monkeypatch):
+    class _WeakrefableModel:
+        pass
+
+    calls = {"n": 0}
+
+    def fake_resolve(model):
+        calls["n"] += 1
+        return {"input_size": (3, 256, 256)}
+
+    monkeypatch.setattr(emb_mod, "resolve_model_data_config", fake_resolve)
+    monkeypatch.setattr(emb_mod, "create_transform", lambda **kwargs: object())
+
+    model_a = _WeakrefableModel()
+    model_b = _WeakrefableModel()
+    first = emb_mod.build_transform_for_mode("timm", model=model_a)
+
+    assert emb_mod.build_transform_for_mode("timm", model=model_a) is first
+    assert emb_mod.build_transform_for_mode("timm", model=model_b) is not first
+    assert calls["n"] == 2
+    assert emb_mod.build_transform_for_mode("letterbox") is emb_mod.build_transform()
+
+
 def test_build_transform_for_mode_rejects_unknown_mode():
     with pytest.raises(ValueError, match="Unknown preprocess mode 'bad'"):
         emb_mod.build_transform_for_mode("bad")
@@ -290,6 +445,44 @@ def test_read_raw_orientation_failure_returns_none(monkeypatch):
     assert emb_mod._read_raw_orientation(Path("/tmp/bad.cr2")) is None
 
 
+def _tiff_bytes_with_orientation(orientation: int) -> bytes:
+    from io import BytesIO
+
+    img = Image.new("RGB", (4, 3))
+    exif = img.getexif()
+    exif[0x0112] = orientation
+    buf = BytesIO()
+    img.save(buf, format="TIFF", exif=exif)
+    return buf.getvalue()
+
+
+def test_orientation_from_tiff_header_reads_ifd0():
+    assert emb_mod._orientation_from_tiff_header(_tiff_bytes_with_orientation(6)) == 6
+    # Big-endian header with a single Orientation=8 entry in IFD0.
+    big_endian = (
+        b"MM\x00*" + (8).to_bytes(4, "big") + (1).to_bytes(2, "big")
+        + (0x0112).to_bytes(2, "big") + (3).to_bytes(2, "big")
+        + (1).to_bytes(4, "big") + (8).to_bytes(2, "big") + b"\x00\x00"
+    )
+    assert emb_mod._orientation_from_tiff_header(big_endian) == 8
+
+
+def test_orientation_from_tiff_header_rejects_non_tiff():
+    with pytest.raises(ValueError):
+        emb_mod._orientation_from_tiff_header(b"\x00\x00\x00\x18ftypcrx ")
+
+
+def test_read_raw_orientation_parses_tiff_without_pil(tmp_path, monkeypatch):
+    path = tmp_path / "a.nef"
+    path.write_bytes(_tiff_bytes_with_orientation(3))
+    monkeypatch.setattr(
+        emb_mod.Image,
+        "open",
+        lambda _p: (_ for _ in ()).throw(AssertionError("PIL should not be needed")),
+    )
+    assert emb_mod._read_raw_orientation(path) == 3
+
+
 def test_load_raw_applies_orientation(monkeypatch):
     class _FakeRaw:
         def __enter__(self):
@@ -298,9 +491,10 @@ def test_load_raw_applies_orientation(monkeypatch):
         def __exit__(self, exc_type, exc, tb):
             return False
 
-        def postprocess(self, half_size, use_camera_wb):
+        def postprocess(self, half_size, use_camera_wb, user_flip):
             assert half_size is True
             assert use_camera_wb is True
+            assert user_flip == 0
             return np.zeros((2, 3, 3), dtype=np.uint8)
 
     monkeypatch.setattr(emb_mod.rawpy, "imread", lambda _p: _FakeRaw())
@@ -317,9 +511,10 @@ def test_load_raw_without_orientation_keeps_original_size(monkeypatch):
         def __exit__(self, exc_type, exc, tb):
             return False
 
-        def postprocess(self, half_size, use_camera_wb):
+        def postprocess(self, half_size, use_camera_wb, user_flip):
             assert half_size is True
             assert use_camera_wb is True
+            assert user_flip == 0
             return np.zeros((2, 3, 3), dtype=np.uint8)
 
     monkeypatch.setattr(emb_mod.rawpy, "imread", lambda _p: _FakeRaw())
@@ -329,6 +524,39 @@ def test_load_raw_without_orientation_keeps_original_size(monkeypatch):
     assert img.size == (3, 2)
 
 
+def test_load_raw_postprocess_uses_libraw_flip_without_reopening(monkeypatch):
+    class _FakeSizes:
+        flip = 6
+
+    class _FakeRaw:
+        def __init__(self):
+            self.sizes = _FakeSizes()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def extract_thumb(self):
+            raise emb_mod.rawpy.LibRawNoThumbnailError()
+
+        def postprocess(self, half_size, use_camera_wb, user_flip):
+            assert user_flip == 0
+            # Like LibRaw, postprocess overwrites sizes.flip with user_flip.
+            self.sizes.flip = user_flip
+            return np.zeros((2, 3, 3), dtype=np.uint8)
+
+    def fail_read(_p):
+        raise AssertionError("orientation should come from raw.sizes.flip")
+
+    monkeypatch.setattr(emb_mod.rawpy, "imread", lambda _p: _FakeRaw())
+    monkeypatch.setattr(emb_mod, "_read_raw_orientation", fail_read)
+
+    img = emb_mod._load_raw(Path("/tmp/rotated.nef"))
+    assert img.size == (2, 3)
+
+
 def test_load_raw_prefers_embedded_jpeg_preview(monkeypatch):
     preview_img = Image.new("RGB", (960, 640), color=(10, 20, 30))
     from io import BytesIO
@@ -375,9 +603,10 @@ def test_load_raw_preview_failure_falls_back_to_postprocess(monkeypatch):
         def extract_thumb(self):
             return _FakeThumb()
 
-        def postprocess(self, half_size, use_camera_wb):
+        def postprocess(self, half_size, use_camera_wb, user_flip):
             assert half_size is True
             assert use_camera_wb is True
+            assert user_flip == 0
             return np.zeros((4, 5, 3), dtype=np.uint8)
 
     monkeypatch.setattr(emb_mod.rawpy, "imread", lambda _p: _FakeRaw())
@@ -409,6 +638,31 @@ def test_load_raw_preview_bitmap_uses_raw_orientation(monkeypatch):
     assert out == ("applied", (3, 2), 8)
 
 
+def test_raw_orientation_prefers_libraw_flip(monkeypatch):
+    class _FakeSizes:
+        flip = 5
+
+    class _FakeRaw:
+        sizes = _FakeSizes()
+
+    def fail_read(_p):
+        raise AssertionError("PIL should not re-open the file when flip is known")
+
+    monkeypatch.setattr(emb_mod, "_read_raw_orientation", fail_read)
+    assert emb_mod._raw_orientation(_FakeRaw(), Path("/tmp/a.nef")) == 8
+
+
+def test_raw_orientation_falls_back_to_pil_without_flip(monkeypatch):
+    class _FakeSizes:
+        flip = 0
+
+    class _FakeRaw:
+        sizes = _FakeSizes()
+
+    monkeypatch.setattr(emb_mod, "_read_raw_orientation", lambda _p: 6)
+    assert emb_mod._raw_orientation(_FakeRaw(), Path("/tmp/a.nef")) == 6
+
+
 def test_load_raw_preview_unsupported_format_returns_none():
     class _FakeThumb:
         format = object()
@@ -421,12 +675,36 @@ def test_load_raw_preview_unsupported_format_returns_none():
     assert emb_mod._load_raw_preview(_FakeRaw(), Path("/tmp/thumb.raw")) is None
 
 
+def test_load_and_preprocess_image_decodes_large_jpeg_at_reduced_scale(tmp_path, monkeypatch):
+    path = tmp_path / "big.jpg"
+    Image.new("RGB", (2048, 1536), color=(200, 100, 50)).save(path, format="JPEG")
+    decoded_sizes = []
+
+    def fake_prescale(img):
+        decoded_sizes.append(img.size)
+        return img
+
+    monkeypatch.setattr(emb_mod, "_prescale", fake_prescale)
+    emb_mod.load_and_preprocess_image(path, lambda img: img.size)
+
+    # 1/4 scale would drop the short side below prescale_size, so 1/2.
+    assert decoded_sizes == [(1024, 768)]
+
+
 def test_prescale_downsizes_large_image():
     img = Image.new("RGB", (2048, 1024))
     out = emb_mod._prescale(img)
     assert max(out.size) <= DEFAULTS.prescale_size
 
 
+def test_prescale_reduces_very_large_image_keeping_aspect():
+    img = Image.new("RGB", (6000, 4000), (10, 20, 30))
+    out = emb_mod._prescale(img)
+    assert out.size == (DEFAULTS.prescale_size, DEFAULTS.prescale_size * 2 // 3)
+    assert out.getpixel((0, 0)) == (10, 20, 30)
+    assert img.size == (6000, 4000)
+
+
 def test_prescale_keeps_small_image():
     img = Image.new("RGB", (200, 120))
     out = emb_mod._prescale(img)
@@ -465,6 +743,13 @@ def test_pool_features_variants():
     torch.testing.assert_close(both, torch.tensor([[1.0, 2.0, 4.0, 5.0]]))
 
 
+def test_pool_features_cls_avg_supports_autograd():
+    features = torch.randn(2, 4, 3, requires_grad=True)
+    both = emb_mod._pool_features(features, "cls+avg")
+    both.sum().backward()
+    assert features.grad is not None
+
+
 def test_pool_features_avg_excludes_all_prefix_tokens():
     # 5 prefix tokens (DINOv3 in timm) + 2 patch tokens
     features = torch.tensor([[
@@ -513,6 +798,7 @@ def test_extract_embeddings_skips_bad_images_and_normalizes(monkeypatch):
         device=torch.device("cpu"),
         batch_size=2,
         pooling="cls",
+        num_workers=0,
     )
 
     assert valid == [0, 2]
@@ -544,6 +830,7 @@ def test_extract_embeddings_raises_when_all_images_fail(monkeypatch):
             device=torch.device("cpu"),
             batch_size=1,
             pooling="cls",
+            num_workers=0,
         )
 
 
@@ -576,6 +863,7 @@ def test_extract_embeddings_on_batch_callback(monkeypatch):
         device=torch.device("cpu"),
         batch_size=2,
         pooling="cls",
+        num_workers=0,
         on_batch=lambda processed, total: progress.append((processed, total)),
     )
 
@@ -585,6 +873,44 @@ def test_extract_embeddings_on_batch_callback(monkeypatch):
     assert progress[-1][0] == 3
 
 
+@pytest.mark.parametrize("with_callback", [True, False])
+def test_extract_embeddings_progress_bar_only_without_on_batch(monkeypatch, with_callback):
+    monkeypatch.setattr(
+        emb_mod,
+        "build_transform_for_mode",
+        lambda preprocess, model=None: "unused",
+    )
+    monkeypatch.setattr(
+        emb_mod,
+        "load_and_preprocess_image",
+        lambda path, _transform: torch.ones((3, 2, 2)),
+    )
+
+    class _FakeModel:
+        def forward_features(self, batch):
+            return torch.ones((batch.shape[0], 3, 2))
+
+    seen = {}
+
+    def fake_tqdm(iterable, **kwargs):
+        seen.update(kwargs)
+        return iterable
+
+    monkeypatch.setattr(emb_mod, "tqdm", fake_tqdm)
+
+    emb_mod.extract_embeddings(
+        paths=[Path("a.jpg")],
+        model=_FakeModel(),
+        device=torch.device("cpu"),
+        batch_size=2,
+        pooling="cls",
+        num_workers=0,
+        on_batch=(lambda processed, total: None) if with_callback else None,
+    )
+
+    assert seen["disable"] is with_callback
+
+
 def test_extract_embeddings_on_batch_none_is_safe(monkeypatch):
     """Verify on_batch=None (default) works without error."""
     monkeypatch.setattr(
@@ -611,6 +937,7 @@ def test_extract_embeddings_on_batch_none_is_safe(monkeypatch):
         device=torch.device("cpu"),
         batch_size=1,
         pooling="cls",
+        num_workers=0,
         on_batch=None,
     )
     assert emb.shape[0] == 1
@@ -642,6 +969,14 @@ def test_detect_device_accepts_valid_devices():
     assert result.type == "cpu"
 
 
+def test_pool_and_normalize_returns_fp32_unit_vectors():
+    features = torch.randn(3, 5, 4, dtype=torch.float16)
+    emb = emb_mod._pool_and_normalize(features, "cls+avg")
+    assert emb.dtype == torch.float32
+    assert emb.shape == (3, 8)
+    assert torch.allclose(emb.norm(dim=1), torch.ones(3), atol=1e-5)
+
+
 def test_pool_features_rejects_unknown_strategy():
     """_pool_features should raise ValueError for invalid pooling strings."""
     features = torch.tensor([[[1.0, 2.0], [3.0, 4.0]]])
@@ -711,6 +1046,7 @@ def test_extract_embeddings_empty_batch_calls_on_batch(monkeypatch):
         device=torch.device("cpu"),
         batch_size=2,
         pooling="cls",
+        num_workers=0,
         on_batch=lambda p, t: progress.append((p, t)),
     )
 
@@ -721,3 +1057,185 @@ def test_extract_embeddings_empty_batch_calls_on_batch(monkeypatch):
     assert progress[1] == (3, 3)
     assert emb.shape[0] == 1
     assert valid == [2]
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_extract_embeddings_with_loader_workers(tmp_path, monkeypatch, start_method):
+    """Decode in DataLoader worker processes; bad files are still skipped.
+
+    ``spawn`` is what macOS uses: the dataset and transform are pickled
+    into a fresh interpreter instead of inherited.
+    """
+    import multiprocessing
+
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{start_method} start method unavailable")
+    created = []
+
+    class _ContextLoader(torch.utils.data.DataLoader):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, multiprocessing_context=start_method, **kwargs)
+            created.append(self.multiprocessing_context.get_start_method())
+
+    monkeypatch.setattr(emb_mod.torch.utils.data, "DataLoader", _ContextLoader)
+    paths = []
+    for i, color in enumerate([(255, 0, 0), (0, 255, 0)]):
+        path = tmp_path / f"img_{i}.jpg"
+        Image.new("RGB", (40, 30), color=color).save(path)
+        paths.append(path)
+    bad = tmp_path / "bad.jpg"
+    bad.write_bytes(b"not an image")
+    paths.insert(1, bad)
+
+    class _FakeModel:
+        def forward_features(self, batch):
+            pooled = batch.mean(dim=(2, 3)).unsqueeze(1)
+            return torch.cat([pooled, pooled], dim=1)
+
+    emb, valid = emb_mod.extract_embeddings(
+        paths=paths,
+        model=_FakeModel(),
+        device=torch.device("cpu"),
+        batch_size=2,
+        pooling="cls",
+        num_workers=1,
+    )
+
+    assert created == [start_method]
+    assert valid == [0, 2]
+    assert emb.shape == (2, 3)
+
+
+def test_default_num_workers_decodes_small_jobs_in_process(monkeypatch):
+    monkeypatch.setattr(emb_mod.os, "cpu_count", lambda: 32)
+    threshold = DEFAULTS.min_images_for_loader_workers
+
+    assert emb_mod._default_num_workers(threshold - 1, 16) == 0
+    assert emb_mod._default_num_workers(10_000, 16) == DEFAULTS.max_loader_workers
+    # Never more workers than batches.
+    assert emb_mod._default_num_workers(threshold, threshold // 2) == 2
+
+
+def test_image_dataset_decodes_batch_on_threads_in_order(monkeypatch):
+    """__getitems__ fans out to threads but keeps index order and failures."""
+    import threading
+
+    thread_names = set()
+
+    def fake_load(path, _transform):
+        thread_names.add(threading.current_thread().name)
+        if path.name == "bad.arw":
+            raise OSError("corrupt")
+        return torch.full((3, 2, 2), float(path.stem[-1]))
+
+    monkeypatch.setattr(emb_mod, "load_and_preprocess_image", fake_load)
+    paths = [Path("/tmp/a0.arw"), Path("/tmp/bad.arw"), Path("/tmp/a2.arw")]
+    dataset = emb_mod._ImageDataset(paths, transform=None, decode_threads=3)
+
+    items = dataset.__getitems__([0, 1, 2])
+
+    assert [idx for idx, _, _ in items] == [0, 1, 2]
+    assert items[0][1][0, 0, 0].item() == 0.0
+    assert items[1][1] is None and items[1][2] == "corrupt"
+    assert items[2][1][0, 0, 0].item() == 2.0
+    assert threading.main_thread().name not in thread_names
+
+
+def test_extract_embeddings_reuses_disk_cache(tmp_path, monkeypatch):
+    """A second run only sends new or changed files through the model."""
+    paths = []
+    for name in ["a.jpg", "b.jpg"]:
+        path = tmp_path / name
+        path.write_bytes(name.encode())
+        paths.append(path)
+    cache_dir = tmp_path / "cache"
+
+    monkeypatch.setattr(
+        emb_mod,
+        "load_and_preprocess_image",
+        lambda path, _t: torch.full((3, 1, 1), float(len(path.read_bytes()))),
+    )
+    monkeypatch.setattr(emb_mod, "build_transform_for_mode", lambda *_a, **_k: None)
+
+    seen_batches = []
+
+    class _FakeModel:
+        def forward_features(self, batch):
+            seen_batches.append(batch.shape[0])
+            return batch.reshape(batch.shape[0], 1, 3)
+
+    def run(progress=None):
+        return emb_mod.extract_embeddings(
+            paths=paths,
+            model=_FakeModel(),
+            device=torch.device("cpu"),
+            batch_size=4,
+            pooling="cls",
+            on_batch=progress,
+            num_workers=0,
+            cache_dir=cache_dir,
+        )
+
+    first, valid = run()
+    assert valid == [0, 1]
+    assert seen_batches == [2]
+
+    paths.insert(1, tmp_path / "c.jpg")
+    paths[1].write_bytes(b"new")
+    progress = []
+    second, valid = run(lambda done, total: progress.append((done, total)))
+
+    assert seen_batches == [2, 1]
+    assert valid == [0, 1, 2]
+    np.testing.assert_allclose(second[[0, 2]], first)
+    assert progress[0] == (2, 3) and progress[-1] == (3, 3)
+
+
+def test_extract_embeddings_pads_short_batches_on_graph_backends(monkeypatch):
+    """Tail batches are zero-padded to batch_size and the padding discarded."""
+    monkeypatch.setattr(emb_mod, "_PAD_BATCH_DEVICE_TYPES", frozenset({"cpu"}))
+    monkeypatch.setattr(
+        emb_mod,
+        "load_and_preprocess_image",
+        lambda path, _t: torch.full((3, 1, 1), float(path.stem[-1]) + 1.0),
+    )
+    monkeypatch.setattr(emb_mod, "build_transform_for_mode", lambda *_a, **_k: None)
+
+    seen_shapes = []
+
+    class _FakeModel:
+        def forward_features(self, batch):
+            seen_shapes.append(batch.shape[0])
+            return batch.reshape(batch.shape[0], 1, 3)
+
+    paths = [Path(f"/tmp/img{i}.jpg") for i in range(5)]
+    emb, valid = emb_mod.extract_embeddings(
+        paths=paths,
+        model=_FakeModel(),
+        device=torch.device("cpu"),
+        batch_size=4,
+        pooling="cls",
+        num_workers=0,
+    )
+
+    assert seen_shapes == [4, 4]
+    assert valid == [0, 1, 2, 3, 4]
+    assert emb.shape == (5, 3)
+
+
+def test_autocast_supported_only_on_accelerators():
+    assert not emb_mod._autocast_supported("cpu")
+
+
+def test_autocast_supported_falls_back_without_probe(monkeypatch):
+    """torch < 2.4 has no is_autocast_available; MPS then runs FP32."""
+    monkeypatch.delattr(emb_mod.torch.amp, "is_autocast_available", raising=False)
+    assert emb_mod._autocast_supported("cuda")
+    assert not emb_mod._autocast_supported("mps")
+
+
+def test_autocast_supported_uses_torch_probe(monkeypatch):
+    monkeypatch.setattr(
+        emb_mod.torch.amp, "is_autocast_available", lambda device_type: False,
+    )
+    assert not emb_mod._autocast_supported("mps")
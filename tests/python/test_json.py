@@ -0,0 +1,34 @@
+"""Tests for photosorter._json — orjson with a stdlib fallback."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from photosorter import _json
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"newline": True, "default": str}, {"indent": True}],
+)
+def test_fallback_matches_orjson_bytes(monkeypatch, kwargs):
+    pytest.importorskip("orjson")
+    obj = {"type": "progress", "detail": "é 1/2", "n": [1, 2], "nested": {"a": None}}
+    if "default" in kwargs:
+        obj["path"] = Path("/tmp/x.jpg")
+    fast = _json.dumps(obj, **kwargs)
+    monkeypatch.setattr(_json, "orjson", None)
+    assert _json.dumps(obj, **kwargs) == fast
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_round_trip(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(_json, "orjson", None)
+    obj = {"rows": {"/a.jpg|1|2": 0}, "dim": 3}
+    data = _json.dumps(obj, newline=True)
+    assert data.endswith(b"\n")
+    assert _json.loads(data) == obj == json.loads(data)
@@ -9,7 +9,7 @@ import numpy as np
 import pytest
 
 from photosorter import main as main_mod
-from photosorter.cache_paths import manifest_path_for_input
+from photosorter.cache_paths import embedding_cache_dir_for_input, manifest_path_for_input
 from photosorter.clustering import ClusterResult
 from photosorter.config import DEFAULTS
 from photosorter.ordering import OrderedPhoto
@@ -162,13 +162,9 @@ def test_run_pipeline_happy_path_with_skipped_images(tmp_path, monkeypatch):
         emb = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float64)
         return emb, [0, 2]  # Skip middle image
 
-    def fake_compute_similarity_matrix(embeddings):
-        calls["compute_similarity_matrix"] = embeddings.copy()
-        return np.array([[1.0, 0.2], [0.2, 1.0]], dtype=np.float64)
-
-    def fake_compute_distance_matrix(similarity, temporal_weight):
-        calls["compute_distance_matrix"] = (similarity.copy(), temporal_weight)
-        return np.array([[0.0, 0.8], [0.8, 0.0]], dtype=np.float64)
+    def fake_compute_condensed_distance(embeddings, temporal_weight):
+        calls["compute_condensed_distance"] = (embeddings.copy(), temporal_weight)
+        return np.array([0.8], dtype=np.float64)
 
     def fake_cluster(distance, threshold, linkage):
         calls["cluster"] = (distance.copy(), threshold, linkage)
@@ -188,8 +184,7 @@ def test_run_pipeline_happy_path_with_skipped_images(tmp_path, monkeypatch):
     monkeypatch.setattr(main_mod, "detect_device", fake_detect_device)
     monkeypatch.setattr(main_mod, "load_model", fake_load_model)
     monkeypatch.setattr(main_mod, "extract_embeddings", fake_extract_embeddings)
-    monkeypatch.setattr(main_mod, "compute_similarity_matrix", fake_compute_similarity_matrix)
-    monkeypatch.setattr(main_mod, "compute_distance_matrix", fake_compute_distance_matrix)
+    monkeypatch.setattr(main_mod, "compute_condensed_distance", fake_compute_condensed_distance)
     monkeypatch.setattr(main_mod, "cluster", fake_cluster)
     monkeypatch.setattr(main_mod, "build_ordered_sequence", fake_build_ordered_sequence)
     monkeypatch.setattr(main_mod, "output_manifest", fake_output_manifest)
@@ -206,6 +201,11 @@ def test_run_pipeline_happy_path_with_skipped_images(tmp_path, monkeypatch):
     )
     main_mod.run_pipeline(args)
 
+    _, temporal_weight = calls["compute_condensed_distance"]
+    assert temporal_weight == 0.25
+    distance, _, _ = calls["cluster"]
+    np.testing.assert_array_equal(distance, np.array([0.8]))
+
     filtered_paths, labels, original_indices = calls["build_ordered_sequence"]
     assert filtered_paths == [discovered[0], discovered[2]]
     np.testing.assert_array_equal(labels, np.array([10, 20]))
@@ -241,8 +241,7 @@ def test_run_pipeline_happy_path_without_skipped_images(tmp_path, monkeypatch):
             [0, 1],  # no skipped images
         ),
     )
-    monkeypatch.setattr(main_mod, "compute_similarity_matrix", lambda _emb: np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float64))
-    monkeypatch.setattr(main_mod, "compute_distance_matrix", lambda _sim, _w: np.array([[0.0, 1.0], [1.0, 0.0]], dtype=np.float64))
+    monkeypatch.setattr(main_mod, "compute_condensed_distance", lambda _emb, _w: np.array([1.0], dtype=np.float64))
     monkeypatch.setattr(main_mod, "cluster", lambda _dist, _th, _link: ClusterResult(labels=np.array([0, 1]), n_clusters=2))
     monkeypatch.setattr(
         main_mod,
@@ -268,3 +267,32 @@ def test_run_pipeline_happy_path_without_skipped_images(tmp_path, monkeypatch):
     assert output_calls["path"] == manifest_path_for_input(tmp_path)
     assert len(output_calls["ordered"]) == 2
     assert not any(level == "warning" and "Skipped" in message for level, message in fake_log.records)
+
+
+def test_run_pipeline_passes_embedding_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(main_mod, "setup_logging", lambda: _FakeLogger())
+    monkeypatch.setattr(main_mod, "discover_images", lambda _input_dir: [tmp_path / "a.jpg"])
+    monkeypatch.setattr(main_mod, "detect_device", lambda _requested: "cpu")
+    monkeypatch.setattr(main_mod, "load_model", lambda _device: "fake-model")
+
+    seen = {}
+
+    def fake_extract_embeddings(paths, model, device, batch_size, pooling, cache_dir=None):
+        seen["cache_dir"] = cache_dir
+        return np.array([[1.0, 0.0]], dtype=np.float64), [0]
+
+    monkeypatch.setattr(main_mod, "extract_embeddings", fake_extract_embeddings)
+    monkeypatch.setattr(main_mod, "compute_condensed_distance", lambda _emb, _w: np.zeros(0))
+    monkeypatch.setattr(main_mod, "cluster", lambda _dist, _th, _link: ClusterResult(labels=np.array([0]), n_clusters=1))
+    monkeypatch.setattr(
+        main_mod,
+        "build_ordered_sequence",
+        lambda paths, labels, *, original_indices=None: [
+            OrderedPhoto(position=0, original_index=0, path=paths[0], cluster_id=0),
+        ],
+    )
+    monkeypatch.setattr(main_mod, "output_manifest", lambda *_a, **_k: None)
+
+    main_mod.run_pipeline(_cli_args(tmp_path))
+
+    assert seen["cache_dir"] == embedding_cache_dir_for_input(tmp_path)
@@ -5,7 +5,7 @@ from pathlib import Path
 import numpy as np
 import pytest
 
-from photosorter.ordering import OrderedPhoto, build_ordered_sequence
+from photosorter.ordering import OrderedPhoto, OrderedPhotos, build_ordered_sequence
 
 
 def _paths(n: int) -> list[Path]:
@@ -111,3 +111,56 @@ class TestBuildOrderedSequence:
         labels = np.array([0, 1])
         with pytest.raises(ValueError, match="original_indices length must match paths length"):
             build_ordered_sequence(paths, labels, original_indices=[0])
+
+    def test_labels_length_must_match_paths(self):
+        paths = _paths(3)
+        with pytest.raises(ValueError, match="labels length must match paths length"):
+            build_ordered_sequence(paths, np.array([0, 1]))
+
+    def test_matches_reference_grouping_on_random_labels(self):
+        rng = np.random.default_rng(7)
+        labels = rng.integers(0, 12, size=200)
+        paths = _paths(len(labels))
+
+        result = build_ordered_sequence(paths, labels)
+
+        first_seen: dict[int, int] = {}
+        for idx, label in enumerate(labels.tolist()):
+            first_seen.setdefault(label, idx)
+        expected = sorted(range(len(labels)), key=lambda i: (first_seen[labels[i]], i))
+        assert [p.original_index for p in result] == expected
+        assert [p.cluster_id for p in result] == [int(labels[i]) for i in expected]
+
+    def test_empty_labels_give_empty_sequence(self):
+        assert len(build_ordered_sequence([], np.array([], dtype=int))) == 0
+
+
+class TestOrderedPhotos:
+    def test_build_returns_parallel_arrays(self):
+        paths = _paths(4)
+        result = build_ordered_sequence(paths, np.array([1, 0, 1, 0]), original_indices=[0, 2, 5, 7])
+
+        assert isinstance(result, OrderedPhotos)
+        assert result.positions.tolist() == [0, 1, 2, 3]
+        assert result.original_indices.tolist() == [0, 5, 2, 7]
+        assert result.cluster_ids.tolist() == [1, 1, 0, 0]
+        assert result.paths == [paths[0], paths[2], paths[1], paths[3]]
+
+    def test_records_round_trip(self):
+        records = [
+            OrderedPhoto(position=0, original_index=3, path=Path("/x/a.jpg"), cluster_id=4),
+            OrderedPhoto(position=1, original_index=1, path=Path("/x/b.jpg"), cluster_id=2),
+        ]
+        photos = OrderedPhotos.from_records(records)
+
+        assert len(photos) == 2
+        assert list(photos) == records
+        assert photos[-1] == records[-1]
+
+    def test_sparse_and_negative_labels_use_same_ordering(self):
+        paths = _paths(5)
+        dense = build_ordered_sequence(paths, np.array([1, 0, 2, 0, 1]))
+        sparse = build_ordered_sequence(paths, np.array([70, -3, 900, -3, 70]))
+
+        assert dense.original_indices.tolist() == sparse.original_indices.tolist()
+        assert sparse.cluster_ids.tolist() == [70, 70, -3, -3, 900]
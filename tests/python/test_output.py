@@ -3,9 +3,10 @@
 import json
 from pathlib import Path
 
+import numpy as np
 import pytest
 
-from photosorter.ordering import OrderedPhoto
+from photosorter.ordering import OrderedPhoto, build_ordered_sequence
 from photosorter.output import output_manifest
 
 
@@ -131,3 +132,75 @@ class TestOutputManifest:
         output_manifest(ordered, manifest_path, input_dir=Path("/input"))
         data = json.loads(manifest_path.read_text())
         assert [c["cluster_id"] for c in data["clusters"]] == [2, 1]
+
+    def test_non_contiguous_clusters_grouped_by_first_appearance(self, tmp_path):
+        ordered = [
+            _photo(5, position=0, original_index=0, name="a.jpg"),
+            _photo(3, position=1, original_index=1, name="b.jpg"),
+            _photo(5, position=2, original_index=2, name="c.jpg"),
+        ]
+        manifest_path = tmp_path / "manifest.json"
+        output_manifest(ordered, manifest_path, input_dir=Path("/input"))
+        data = json.loads(manifest_path.read_text())
+        assert [c["cluster_id"] for c in data["clusters"]] == [5, 3]
+        assert [p["filename"] for p in data["clusters"][0]["photos"]] == ["a.jpg", "c.jpg"]
+
+    def test_accepts_ordered_photos_arrays(self, tmp_path):
+        ordered = build_ordered_sequence(
+            [Path("/fake/a.jpg"), Path("/fake/b.jpg"), Path("/fake/c.jpg")],
+            np.array([1, 0, 1]),
+        )
+        manifest_path = tmp_path / "manifest.json"
+        output_manifest(ordered, manifest_path, input_dir=Path("/input"))
+        data = json.loads(manifest_path.read_text())
+        assert data["total"] == 3
+        assert [c["count"] for c in data["clusters"]] == [2, 1]
+        assert [p["position"] for p in data["clusters"][0]["photos"]] == [0, 1]
+        assert isinstance(data["clusters"][0]["cluster_id"], int)
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_streamed_output_matches_json_dumps_layout(self, tmp_path, monkeypatch, use_orjson):
+        from photosorter import _json
+
+        if use_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(_json, "orjson", None)
+        ordered = [
+            _photo(0, position=0, original_index=0, name="a.jpg"),
+            _photo(0, position=1, original_index=1, name="b.jpg"),
+            _photo(1, position=2, original_index=2, name="c.jpg"),
+        ]
+        manifest_path = tmp_path / "manifest.json"
+        output_manifest(ordered, manifest_path, input_dir=Path("/input"), linkage="complete")
+
+        text = manifest_path.read_text()
+        assert text == json.dumps(json.loads(text), indent=2) + "\n"
+        assert not (tmp_path / "manifest.json.tmp").exists()
+
+    def test_empty_streamed_output_matches_json_dumps_layout(self, tmp_path):
+        manifest_path = tmp_path / "manifest.json"
+        output_manifest([], manifest_path, input_dir=Path("/input"))
+
+        text = manifest_path.read_text()
+        assert text == json.dumps(json.loads(text), indent=2) + "\n"
+
+    def test_original_path_is_absolute_and_resolves_parent(self, tmp_path, monkeypatch):
+        real_dir = tmp_path / "real"
+        real_dir.mkdir()
+        link_dir = tmp_path / "link"
+        link_dir.symlink_to(real_dir, target_is_directory=True)
+        monkeypatch.chdir(tmp_path)
+
+        ordered = [
+            OrderedPhoto(position=0, original_index=0, path=Path("link/a.jpg"), cluster_id=0),
+            OrderedPhoto(position=1, original_index=1, path=Path("link/b.jpg"), cluster_id=0),
+        ]
+        manifest_path = tmp_path / "manifest.json"
+        output_manifest(ordered, manifest_path, input_dir=Path("/input"))
+        data = json.loads(manifest_path.read_text())
+        original_paths = [p["original_path"] for p in data["clusters"][0]["photos"]]
+        assert original_paths == [
+            str(real_dir.resolve() / "a.jpg"),
+            str(real_dir.resolve() / "b.jpg"),
+        ]
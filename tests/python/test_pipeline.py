@@ -207,3 +207,32 @@ class TestConstantSets:
 
     def test_device_options(self):
         assert VALID_DEVICE_OPTIONS == {"auto", "cpu", "mps", "cuda"}
+
+
+class TestProbeExtractKwargs:
+    def test_reports_supported_optional_kwargs(self):
+        from photosorter.pipeline import _probe_extract_kwargs
+
+        def extract(paths, model, device, batch_size, pooling, on_batch=None, cache_dir=None):
+            return None
+
+        assert _probe_extract_kwargs(extract) == {"on_batch", "cache_dir"}
+
+    def test_signature_is_probed_once_per_function(self, monkeypatch):
+        import photosorter.pipeline as pipeline_mod
+
+        calls = {"n": 0}
+        real_signature = pipeline_mod.inspect.signature
+
+        def counting_signature(fn):
+            calls["n"] += 1
+            return real_signature(fn)
+
+        monkeypatch.setattr(pipeline_mod.inspect, "signature", counting_signature)
+
+        def extract(paths, model, device, batch_size, pooling, preprocess=None):
+            return None
+
+        for _ in range(3):
+            assert pipeline_mod._probe_extract_kwargs(extract) == {"preprocess"}
+        assert calls["n"] == 1
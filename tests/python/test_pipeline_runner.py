@@ -167,13 +167,8 @@ class TestRunPipelineWithProgress:
         monkeypatch.setattr(runner_mod, "extract_embeddings", fake_extract)
         monkeypatch.setattr(
             runner_mod,
-            "compute_similarity_matrix",
-            lambda e: np.array([[1.0, 0.2], [0.2, 1.0]]),
-        )
-        monkeypatch.setattr(
-            runner_mod,
-            "compute_distance_matrix",
-            lambda s, tw: np.array([[0.0, 0.8], [0.8, 0.0]]),
+            "compute_condensed_distance",
+            lambda e, tw: np.array([0.8]),
         )
         monkeypatch.setattr(
             runner_mod,
@@ -238,12 +233,8 @@ class TestRunPipelineWithProgress:
 
         monkeypatch.setattr(runner_mod, "extract_embeddings", fake_extract)
         monkeypatch.setattr(
-            runner_mod, "compute_similarity_matrix",
-            lambda e: np.array([[1.0, 0.2], [0.2, 1.0]]),
-        )
-        monkeypatch.setattr(
-            runner_mod, "compute_distance_matrix",
-            lambda s, tw: np.array([[0.0, 0.8], [0.8, 0.0]]),
+            runner_mod, "compute_condensed_distance",
+            lambda e, tw: np.array([0.8]),
         )
 
         build_seq_args = {}
@@ -296,8 +287,7 @@ class TestRunPipelineWithProgress:
             return np.array([[1.0, 0.0]]), [0]
 
         monkeypatch.setattr(runner_mod, "extract_embeddings", fake_extract)
-        monkeypatch.setattr(runner_mod, "compute_similarity_matrix", lambda e: np.array([[1.0]]))
-        monkeypatch.setattr(runner_mod, "compute_distance_matrix", lambda s, tw: np.array([[0.0]]))
+        monkeypatch.setattr(runner_mod, "compute_condensed_distance", lambda e, tw: np.zeros(0))
         monkeypatch.setattr(
             runner_mod,
             "cluster",
@@ -321,6 +311,41 @@ class TestRunPipelineWithProgress:
 
         assert seen["preprocess"] == "timm"
 
+    def test_condensed_distance_receives_resolved_device(self, tmp_path, monkeypatch):
+        import photosorter_bridge.pipeline_runner as runner_mod
+
+        monkeypatch.setattr(runner_mod, "discover_images", lambda _d: [tmp_path / "a.jpg"])
+        monkeypatch.setattr(runner_mod, "detect_device", lambda _d: "resolved-device")
+        monkeypatch.setattr(runner_mod, "load_model", lambda _d: "fake-model")
+        monkeypatch.setattr(
+            runner_mod,
+            "extract_embeddings",
+            lambda paths, model, device, batch_size, pooling: (np.array([[1.0, 0.0]]), [0]),
+        )
+
+        seen: dict[str, object] = {}
+
+        def fake_condensed(embeddings, temporal_weight, device=None):
+            seen["device"] = device
+            return np.zeros(0)
+
+        monkeypatch.setattr(runner_mod, "compute_condensed_distance", fake_condensed)
+        monkeypatch.setattr(
+            runner_mod,
+            "cluster",
+            lambda d, dt, l: ClusterResult(labels=np.array([0]), n_clusters=1),
+        )
+        monkeypatch.setattr(
+            runner_mod,
+            "build_ordered_sequence",
+            lambda p, l, *, original_indices=None: [OrderedPhoto(0, 0, p[0], 0)],
+        )
+        monkeypatch.setattr(runner_mod, "output_manifest", lambda *_a, **_k: None)
+
+        run_pipeline_with_progress(self._params(tmp_path), lambda info: None)
+
+        assert seen["device"] == "resolved-device"
+
     def test_extract_signature_introspection_failure_uses_basic_call(self, tmp_path, monkeypatch):
         import photosorter.pipeline as pipeline_mod
         import photosorter_bridge.pipeline_runner as runner_mod
@@ -338,8 +363,7 @@ class TestRunPipelineWithProgress:
             return np.array([[1.0, 0.0]]), [0]
 
         monkeypatch.setattr(runner_mod, "extract_embeddings", fake_extract)
-        monkeypatch.setattr(runner_mod, "compute_similarity_matrix", lambda e: np.array([[1.0]]))
-        monkeypatch.setattr(runner_mod, "compute_distance_matrix", lambda s, tw: np.array([[0.0]]))
+        monkeypatch.setattr(runner_mod, "compute_condensed_distance", lambda e, tw: np.zeros(0))
         monkeypatch.setattr(
             runner_mod,
             "cluster",
@@ -363,3 +387,45 @@ class TestRunPipelineWithProgress:
 
         assert result.manifest_path == manifest_path_for_input(tmp_path)
         assert seen_kwargs == {}
+
+
+class TestProgressThrottle:
+    def _throttle(self):
+        from photosorter_bridge.pipeline_runner import _ProgressThrottle
+
+        seen: list[StepInfo] = []
+        clock = {"now": 100.0}
+        throttle = _ProgressThrottle(seen.append, clock=lambda: clock["now"])
+        return throttle, seen, clock
+
+    def test_coalesces_fast_small_updates(self):
+        throttle, seen, _clock = self._throttle()
+        throttle("embed", "0/1000", 0, 1000)
+        for processed in range(1, 10):
+            throttle("embed", f"{processed}/1000", processed, 1000)
+        throttle("embed", "1000/1000", 1000, 1000)
+
+        assert [info.processed for info in seen] == [0, 1000]
+
+    def test_forwards_after_interval_or_one_percent(self):
+        throttle, seen, clock = self._throttle()
+        throttle("embed", "", 0, 1000)
+        throttle("embed", "", 10, 1000)  # 1% of total
+        clock["now"] += 0.05
+        throttle("embed", "", 11, 1000)  # interval elapsed
+
+        assert [info.processed for info in seen] == [0, 10, 11]
+
+    def test_step_changes_always_forwarded(self):
+        throttle, seen, _clock = self._throttle()
+        throttle("discover", "Discovering", 0, 0)
+        throttle("discover", "Found 3", 3, 3)
+        throttle("model", "Loading", 0, 0)
+        throttle("model", "Loaded", 0, 0)
+
+        assert [(info.step, info.detail) for info in seen] == [
+            ("discover", "Discovering"),
+            ("discover", "Found 3"),
+            ("model", "Loading"),
+            ("model", "Loaded"),
+        ]
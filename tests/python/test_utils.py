@@ -3,7 +3,7 @@
 from pathlib import Path
 
 from photosorter import utils as utils_mod
-from photosorter.utils import discover_images, natural_sort_key
+from photosorter.utils import discover_images, natural_sort_key, resolve_paths
 
 
 def test_natural_sort_key_orders_digit_groups():
@@ -12,6 +12,11 @@ def test_natural_sort_key_orders_digit_groups():
     assert [p.name for p in ordered] == ["IMG_1.jpg", "IMG_2.jpg", "IMG_10.jpg"]
 
 
+def test_natural_sort_key_alternates_text_and_numbers():
+    assert natural_sort_key(Path("IMG_10-2B.jpg")) == ["img_", 10, "-", 2, "b"]
+    assert natural_sort_key(Path("0042.jpg")) == ["", 42, ""]
+
+
 def test_discover_images_filters_supported_extensions_and_sorts(tmp_path):
     # Supported files (mixed case extensions)
     (tmp_path / "IMG_10.JPG").write_text("x")
@@ -28,6 +33,41 @@ def test_discover_images_filters_supported_extensions_and_sorts(tmp_path):
     assert all(p.parent == tmp_path for p in images)
 
 
+def test_discover_images_follows_file_symlinks_and_skips_image_named_dirs(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "IMG_3.jpg").write_text("x")
+    album = tmp_path / "album"
+    album.mkdir()
+    (album / "IMG_1.jpg").write_text("x")
+    (album / "IMG_3.jpg").symlink_to(source / "IMG_3.jpg")
+    (album / "IMG_2.jpg").mkdir()
+
+    images = discover_images(album)
+    assert [p.name for p in images] == ["IMG_1.jpg", "IMG_3.jpg"]
+
+
+def test_resolve_paths_resolves_each_folder_once(tmp_path, monkeypatch):
+    real = tmp_path / "real"
+    real.mkdir()
+    link = tmp_path / "link"
+    link.symlink_to(real)
+    expected_dir = real.resolve()
+    calls = []
+    original_resolve = type(tmp_path).resolve
+
+    def counting_resolve(self, *args, **kwargs):
+        calls.append(self)
+        return original_resolve(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(tmp_path), "resolve", counting_resolve)
+
+    resolved = resolve_paths([link / "a.jpg", link / "b.jpg"])
+
+    assert resolved == [str(expected_dir / "a.jpg"), str(expected_dir / "b.jpg")]
+    assert calls == [link]
+
+
 def test_setup_logging_configures_and_returns_photosorter_logger(monkeypatch):
     called = {}
 